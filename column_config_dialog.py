@@ -23,12 +23,20 @@ COLUMN_EDITABLE = '表示＋編集'
 COLUMN_INFO = '情報'
 
 _STATES = [COLUMN_HIDDEN, COLUMN_DISPLAY, COLUMN_EDITABLE, COLUMN_INFO]
-_BTN_STYLE = {
-    COLUMN_HIDDEN: 'QPushButton{background:#cccccc;color:#666666;border:1px solid #aaa;padding:2px 8px;}',
-    COLUMN_DISPLAY: 'QPushButton{background:#4a90d9;color:white;border:1px solid #357abd;padding:2px 8px;}',
-    COLUMN_EDITABLE: 'QPushButton{background:#27ae60;color:white;border:1px solid #1e8449;padding:2px 8px;}',
-    COLUMN_INFO: 'QPushButton{background:#e67e22;color:white;border:1px solid #ca6f1e;padding:2px 8px;}',
+# ボタンの動的プロパティ state の値
+_STATE_PROP = {
+    COLUMN_HIDDEN: 'hidden',
+    COLUMN_DISPLAY: 'display',
+    COLUMN_EDITABLE: 'editable',
+    COLUMN_INFO: 'info',
 }
+# ダイアログに1回だけ設定し、ボタンの見た目は state プロパティで切り替える
+_BTN_STYLE = (
+    'QPushButton[state="hidden"]{background:#cccccc;color:#666666;border:1px solid #aaa;padding:2px 8px;}'
+    'QPushButton[state="display"]{background:#4a90d9;color:white;border:1px solid #357abd;padding:2px 8px;}'
+    'QPushButton[state="editable"]{background:#27ae60;color:white;border:1px solid #1e8449;padding:2px 8px;}'
+    'QPushButton[state="info"]{background:#e67e22;color:white;border:1px solid #ca6f1e;padding:2px 8px;}'
+)
 
 _FILTER_ALL = '全て'
 _FILTER_DISPLAY = '表示のみ'
@@ -53,18 +61,24 @@ class ColumnConfigDialog(QDialog, FORM_CLASS):
     def __init__(self, columns, current_config=None, parent=None):
         super().__init__(parent)
         self.setupUi(self)
+        self.setStyleSheet(_BTN_STYLE)
         self.columns = list(columns)
         self._config = {}
         for col in self.columns:
             self._config[col] = (current_config or {}).get(col, COLUMN_HIDDEN)
+        # 番号表示用の元の並び順 (1始まり)
+        self._col_indices = {c: i + 1 for i, c in enumerate(self.columns)}
+        # フィルタ番号 → 絞り込み済みカラムリスト（状態変更時にクリア）
+        self._filter_cache = {}
 
         self._current_page = 0
         self._current_filter_idx = 0
-        self._grid_widgets = []
 
         self._grid_layout = QGridLayout(self.gridContainer)
         self._grid_layout.setSpacing(2)
         self._grid_layout.setContentsMargins(0, 0, 0, 0)
+        self._btn_texts = self._button_texts()
+        self._pool = self._create_pool()
 
         # 下部エリアを左右50:50に分割
         self.bottomArea.setStretch(0, 1)  # spacer
@@ -94,7 +108,13 @@ class ColumnConfigDialog(QDialog, FORM_CLASS):
         }
 
     def _get_filtered_columns(self):
-        f = _FILTERS[self._current_filter_idx]
+        key = self._current_filter_idx
+        filtered = self._filter_cache.get(key)
+        if filtered is None:
+            filtered = self._filter_cache[key] = self._filter_columns(_FILTERS[key])
+        return filtered
+
+    def _filter_columns(self, f):
         if f == _FILTER_ALL:
             return self.columns
         elif f == _FILTER_DISPLAY:
@@ -110,51 +130,30 @@ class ColumnConfigDialog(QDialog, FORM_CLASS):
     def _total_pages(self, filtered):
         return max(1, math.ceil(len(filtered) / self.ITEMS_PER_PAGE))
 
-    def _clear_grid(self):
-        for widgets in self._grid_widgets:
-            for w in widgets:
-                self._grid_layout.removeWidget(w)
-                w.setParent(None)
-        self._grid_widgets.clear()
-        while self._grid_layout.count():
-            item = self._grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().setParent(None)
-
-    def _rebuild_grid(self):
-        self._clear_grid()
-
-        filtered = self._get_filtered_columns()
-        total_pages = self._total_pages(filtered)
-        self._current_page = max(0, min(self._current_page, total_pages - 1))
-
-        start = self._current_page * self.ITEMS_PER_PAGE
-        end = min(start + self.ITEMS_PER_PAGE, len(filtered))
-        page_items = filtered[start:end]
-
-        # Build original index map for numbering
-        col_indices = {c: i + 1 for i, c in enumerate(self.columns)}
+    def _create_pool(self):
+        """1ページ分のラベル・ボタンを作成してグリッドに固定配置する。
 
-        for i, col_name in enumerate(page_items):
+        ページ・フィルタ切替時はウィジェットを作り直さず、表示内容だけ差し替える。
+        """
+        pool = []
+        for i in range(self.ITEMS_PER_PAGE):
             grid_col = i // self.ROWS_PER_PAGE
             grid_row = i % self.ROWS_PER_PAGE
 
-            num = col_indices[col_name]
-            label = QLabel(f'{num}: {col_name}')
+            label = QLabel()
             label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
 
             btn = QPushButton()
             btn.setMinimumWidth(60)
             btn.setFocusPolicy(Qt.StrongFocus)
-            self._apply_btn_state(btn, self._config[col_name])
             btn.clicked.connect(
-                lambda _, cn=col_name, b=btn: self._cycle_state(cn, b)
+                lambda _, b=btn: self._cycle_state(b.property('col_name'), b)
             )
 
             base_col = grid_col * 2
             self._grid_layout.addWidget(label, grid_row, base_col)
             self._grid_layout.addWidget(btn, grid_row, base_col + 1)
-            self._grid_widgets.append((label, btn))
+            pool.append((label, btn))
 
         # Column stretch: labels expand, buttons don't
         self._grid_layout.setColumnStretch(0, 1)
@@ -163,9 +162,46 @@ class ColumnConfigDialog(QDialog, FORM_CLASS):
         self._grid_layout.setColumnStretch(3, 0)
 
         # Vertical spacer to push items up
-        max_row = min(len(page_items), self.ROWS_PER_PAGE)
         spacer = QSpacerItem(0, 0, QSizePolicy.Minimum, QSizePolicy.Expanding)
-        self._grid_layout.addItem(spacer, max_row, 0)
+        self._grid_layout.addItem(spacer, self.ROWS_PER_PAGE, 0)
+        return pool
+
+    def _rebuild_grid(self, first_slot=0):
+        """現在ページを表示する。first_slot 以降のスロットだけを更新する。"""
+        # スロットごとの再レイアウト・再描画を抑止し、最後に1回だけ反映する
+        self.gridContainer.setUpdatesEnabled(False)
+        self._grid_layout.setEnabled(False)
+        try:
+            self._update_grid(first_slot)
+        finally:
+            self._grid_layout.setEnabled(True)
+            self.gridContainer.setUpdatesEnabled(True)
+
+    def _update_grid(self, first_slot):
+        filtered = self._get_filtered_columns()
+        total_pages = self._total_pages(filtered)
+        page = max(0, min(self._current_page, total_pages - 1))
+        if page != self._current_page:
+            # 最終ページが空になった等でページが変わったら全スロットを更新する
+            self._current_page = page
+            first_slot = 0
+
+        start = self._current_page * self.ITEMS_PER_PAGE
+        end = min(start + self.ITEMS_PER_PAGE, len(filtered))
+        page_items = filtered[start:end]
+
+        for i in range(first_slot, len(self._pool)):
+            label, btn = self._pool[i]
+            if i < len(page_items):
+                col_name = page_items[i]
+                label.setText(f'{self._col_indices[col_name]}: {col_name}')
+                btn.setProperty('col_name', col_name)
+                self._apply_btn_state(btn, self._config[col_name])
+                label.setVisible(True)
+                btn.setVisible(True)
+            else:
+                label.setVisible(False)
+                btn.setVisible(False)
 
         # Navigation state
         self.lblPage.setText(f'{self._current_page + 1}/{total_pages}')
@@ -176,15 +212,31 @@ class ColumnConfigDialog(QDialog, FORM_CLASS):
         )
 
     def _apply_btn_state(self, btn, state):
-        btn.setText(self._button_texts()[state])
-        btn.setStyleSheet(_BTN_STYLE[state])
+        btn.setText(self._btn_texts[state])
+        prop = _STATE_PROP[state]
+        if btn.property('state') != prop:
+            btn.setProperty('state', prop)
+            # プロパティセレクタを再評価させる
+            btn.style().unpolish(btn)
+            btn.style().polish(btn)
 
     def _cycle_state(self, col_name, btn):
         current = self._config[col_name]
         idx = _STATES.index(current)
         next_state = _STATES[(idx + 1) % len(_STATES)]
         self._config[col_name] = next_state
-        self._apply_btn_state(btn, next_state)
+
+        # 表示中のフィルタの一覧だけ残し、他のフィルタは次回参照時に作り直す
+        filtered = self._get_filtered_columns()
+        self._filter_cache = {self._current_filter_idx: filtered}
+        if _FILTERS[self._current_filter_idx] == _FILTER_ALL:
+            self._apply_btn_state(btn, next_state)
+            return
+
+        # 状態別フィルタでは対象外になったので一覧から外し、以降のスロットを詰める
+        pos = filtered.index(col_name)
+        del filtered[pos]
+        self._rebuild_grid(pos - self._current_page * self.ITEMS_PER_PAGE)
 
     def _prev_page(self):
         if self._current_page > 0:
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from qgis.PyQt.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class _FetchSignals(QObject):
+    """ワーカーから GUI スレッドへ結果を届けるシグナル。"""
+
+    finished = pyqtSignal(int, list)
+    failed = pyqtSignal(int, str)
+
+
+class FeatureFetchWorker(QRunnable):
+    """結合済みデータの取得をスレッドプールで実行する。
+
+    fetch は GpkgDataManager.prepare_merged_fetch が返す関数。
+    結果は finished(ジョブID, 行リスト)、例外は failed(ジョブID, メッセージ) で通知する。
+    受け取った側はジョブIDを照合し、古い要求の結果を捨てる。
+    """
+
+    def __init__(self, job_id, fetch):
+        super().__init__()
+        self.job_id = job_id
+        self._fetch = fetch
+        self.signals = _FetchSignals()
+
+    def run(self):
+        try:
+            rows = self._fetch()
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.finished.emit(self.job_id, rows)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+from qgis.PyQt.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from qgis.PyQt.QtGui import QBrush, QColor
+
+# テキスト色
+COLOR_EDITABLE = QBrush(QColor(0, 0, 255))   # 青: 編集可能（未編集）
+COLOR_EDITED = QBrush(QColor(255, 0, 0))      # 赤: 編集済み
+
+# セルのフラグ（セルごとに組み立てず共有する）
+FLAGS_READONLY = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+FLAGS_EDITABLE = FLAGS_READONLY | Qt.ItemIsEditable
+
+
+class FeatureTableModel(QAbstractTableModel):
+    """結合済みデータ（get_merged_features の行リスト）を表示するテーブルモデル。
+
+    セルごとのアイテムは持たず、ビューが必要とした表示セルの値だけを行辞書から返す。
+    編集可能セルが書き換えられると valueEdited(行番号, カラム名, 値) を発行する。
+    set_values_bulk による一括編集では valuesEdited([(行番号, カラム名, 値), ...]) を
+    1回だけ発行する。保存は受け取った側で行う。書き込み前の値は set_value で
+    表示だけを更新し、書き込みが確定したら mark_saved / mark_edited_bulk で
+    編集済みにする。
+    """
+
+    valueEdited = pyqtSignal(int, str, str)
+    valuesEdited = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._cols = []
+        self._edit_cols = frozenset()
+        self._col_editable = []  # 列番号 → 編集可能か
+        self._col_flags = []  # 列番号 → セルのフラグ
+        self._row_fids = []  # 行番号 → fid
+        self._fid_rows = {}  # fid → 行番号
+
+    def set_data(self, rows, cols, edit_cols):
+        """表示データを差し替える。rows はコピーせずそのまま参照する。"""
+        self.beginResetModel()
+        self._rows = rows
+        self._cols = list(cols)
+        self._edit_cols = frozenset(edit_cols)
+        self._col_editable = [c in self._edit_cols for c in self._cols]
+        self._col_flags = [
+            FLAGS_EDITABLE if editable else FLAGS_READONLY
+            for editable in self._col_editable
+        ]
+        self._row_fids = [row_data['fid'] for row_data in rows]
+        self._fid_rows = {fid: i for i, fid in enumerate(self._row_fids)}
+        self.endResetModel()
+
+    def clear(self):
+        self.set_data([], [], ())
+
+    def append_rows(self, rows):
+        """行を末尾に追加する（既存行は作り直さない）。"""
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        for i, row_data in enumerate(rows, first):
+            fid = row_data['fid']
+            self._row_fids.append(fid)
+            self._fid_rows[fid] = i
+        self.endInsertRows()
+
+    def remove_fids(self, fids):
+        """指定 fid の行を削除する。
+
+        連続する行はまとめて削除し、行番号がずれないよう下の行から処理する。
+        """
+        fid_rows = self._fid_rows
+        rows = sorted((fid_rows[fid] for fid in fids if fid in fid_rows), reverse=True)
+        if not rows:
+            return
+        # 下から連続区間 [start, end] ごとに削除する
+        end = start = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == start - 1:
+                start = row
+                continue
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._rows[start:end + 1]
+            del self._row_fids[start:end + 1]
+            self.endRemoveRows()
+            end = start = row
+        self._fid_rows = {fid: i for i, fid in enumerate(self._row_fids)}
+
+    def rows(self):
+        return self._rows
+
+    def row_data(self, row):
+        return self._rows[row]
+
+    def fid(self, row):
+        return self._row_fids[row]
+
+    def fids(self, rows):
+        """行番号の並びに対応する fid のリストを返す。"""
+        row_fids = self._row_fids
+        return [row_fids[row] for row in rows]
+
+    def row_of(self, fid):
+        """fid の行番号を返す（表示していなければ None）。"""
+        return self._fid_rows.get(fid)
+
+    def column_name(self, col):
+        return self._cols[col]
+
+    def set_values_bulk(self, values):
+        """(index, 値) の組をまとめて編集する。
+
+        編集可能で値が変わるセルだけを集め、valuesEdited で1回だけ通知する。
+        """
+        changes = []
+        col_editable = self._col_editable
+        for index, value in values:
+            if not index.isValid() or not col_editable[index.column()]:
+                continue
+            text = '' if value is None else str(value)
+            if text == self.data(index, Qt.EditRole):
+                continue
+            changes.append((index.row(), self._cols[index.column()], text))
+        if changes:
+            self.valuesEdited.emit(changes)
+
+    def set_value(self, row, col_name, value):
+        """書き込み待ちの編集値を行データに反映する（編集済み表示にはしない）。"""
+        self._rows[row][col_name] = value
+        index = self.index(row, self._cols.index(col_name))
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def mark_saved(self, edits):
+        """書き込みが確定した編集 [(fid, カラム名, 値), ...] を編集済み（赤字）表示にする。
+
+        表示していない行・カラムの編集は無視する。
+        """
+        fid_rows = self._fid_rows
+        cols = set(self._cols)
+        self.mark_edited_bulk([
+            (fid_rows[fid], col_name, value) for fid, col_name, value in edits
+            if fid in fid_rows and col_name in cols
+        ])
+
+    def mark_edited_bulk(self, changes):
+        """保存済みの編集 [(行番号, カラム名, 値), ...] を反映し、まとめて再描画を通知する。"""
+        if not changes:
+            return
+        col_idx = {c: i for i, c in enumerate(self._cols)}
+        rows = []
+        cols = []
+        for row, col_name, value in changes:
+            row_data = self._rows[row]
+            row_data[col_name] = value
+            edited_cols = row_data.get('_edited_cols', frozenset())
+            if col_name not in edited_cols:
+                # 共有の空 frozenset を書き換えないよう新しい集合にする
+                row_data['_edited_cols'] = edited_cols | {col_name}
+            rows.append(row)
+            cols.append(col_idx[col_name])
+        self.dataChanged.emit(
+            self.index(min(rows), min(cols)),
+            self.index(max(rows), max(cols)),
+            [Qt.DisplayRole, Qt.ForegroundRole],
+        )
+
+    # ── QAbstractTableModel ──
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cols)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            value = self._rows[index.row()].get(self._cols[index.column()], '')
+            return str(value) if value is not None else ''
+        if role == Qt.ForegroundRole:
+            col = index.column()
+            if self._col_editable[col]:
+                # 色分け: 編集済み=赤、未編集=青（表示のみ = 黒（デフォルト））
+                if self._cols[col] in self._rows[index.row()].get('_edited_cols', ()):
+                    return COLOR_EDITED
+                return COLOR_EDITABLE
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            if 0 <= section < len(self._cols):
+                return self._cols[section]
+            return None
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return self._col_flags[index.column()]
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        if not self._col_editable[index.column()]:
+            return False
+        text = '' if value is None else str(value)
+        if text == self.data(index, Qt.EditRole):
+            return True  # 値が変わらない場合は保存しない
+        self.valueEdited.emit(index.row(), self._cols[index.column()], text)
+        return True
@@ -4,6 +4,7 @@ import re
 import csv
 import json
 import sqlite3
+from contextlib import contextmanager
 
 from qgis.core import (
     QgsVectorLayer,
@@ -13,9 +14,67 @@ from qgis.core import (
     QgsField,
     QgsFields,
     QgsFeatureRequest,
+    QgsGeometry,
+    QgsSpatialIndex,
+    QgsVectorLayerFeatureSource,
     QgsCoordinateTransformContext,
+    QgsMessageLog,
+    Qgis,
 )
-from qgis.PyQt.QtCore import QVariant
+from qgis.PyQt.QtCore import QTimer, QVariant
+
+# 編集データをまとめて書き込むまでの待ち時間（ミリ秒）
+EDIT_FLUSH_DELAY_MS = 250
+
+# 結合処理で編集データをまとめて読み込むフィーチャー数
+MERGE_BATCH_SIZE = 5000
+
+# GPKG出力時にまとめて書き込むフィーチャー数
+EXPORT_CHUNK_SIZE = 10000
+
+# CSV出力時のファイル書き込みバッファ（バイト）とまとめて書き込む行数
+CSV_WRITE_BUFFER = 1 << 20
+CSV_CHUNK_SIZE = 2000
+
+# GPKG出力中だけ適用する GDAL (SQLite) 設定。
+# 出力先は新規ファイルのため、フィーチャーごとのコミットで fsync しないようにする。
+EXPORT_GDAL_OPTIONS = {
+    'OGR_SQLITE_SYNCHRONOUS': 'OFF',
+    'OGR_SQLITE_CACHE': '512',
+}
+
+# 編集データテーブルの定義。主キーで検索するため WITHOUT ROWID で主キー順に格納する。
+_EDITS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        plan_name TEXT NOT NULL,
+        orig_fid INTEGER NOT NULL,
+        col_name TEXT NOT NULL,
+        value,
+        PRIMARY KEY (plan_name, orig_fid, col_name)
+    ) WITHOUT ROWID
+'''
+
+
+@contextmanager
+def _gdal_config(options):
+    """GDAL設定オプションを一時的に変更し、終了時に元の値へ戻す。"""
+    try:
+        from osgeo import gdal
+    except ImportError:
+        yield
+        return
+    saved = {key: gdal.GetConfigOption(key) for key in options}
+    for key, value in options.items():
+        gdal.SetConfigOption(key, value)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            gdal.SetConfigOption(key, value)
+
+
+# 編集のない行に共有で付ける _edited_cols
+_NO_EDITS = frozenset()
 
 
 class GpkgDataManager:
@@ -25,14 +84,30 @@ class GpkgDataManager:
     出力時に結合する。
     """
 
-    def __init__(self):
+    def __init__(self, flushed_callback=None, flush_failed_callback=None):
         self.original_path = None
         self.original_layer = None  # QgsVectorLayer
         self.layer_name = None
         self._db_path = None        # 管理用SQLiteパス
+        self._conn = None           # 管理用SQLiteの常設接続
+        self._edit_buffer = {}      # 未書き込みの編集 {(plan_name, orig_fid, col_name): value}
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._on_flush_timer)
+        # 書き込み確定時に [(plan_name, orig_fid, col_name, value), ...] を受け取る関数
+        self._flushed_callback = flushed_callback
+        # タイマーによる書き込みの失敗時に sqlite3.Error を受け取る関数
+        self._flush_failed_callback = flush_failed_callback
+        self._sindex = None         # オリジナルレイヤーの空間インデックス（初回検索時に構築）
+        self._fields = None         # オリジナルレイヤーの QgsFields
+        self._field_names = []      # フィールド名（フィールド番号順）
+        self._field_idx = {}        # フィールド名 → フィールド番号
 
     def load_gpkg(self, path, layername=None):
         """オリジナルGPKGを読み込む。layername を指定すると複数レイヤーGPKGで正しいレイヤーを開く。"""
+        # 前のGPKGの管理用DBは未書き込みの編集を反映してから閉じる
+        self._close_db()
+        self._sindex = None
         self.original_path = path
         base, _ = os.path.splitext(path)
         self._db_path = base + '_data.sqlite'
@@ -48,9 +123,16 @@ class GpkgDataManager:
         if not self.original_layer.isValid():
             raise ValueError(f'GPKGファイルを読み込めません: {path}')
 
+        # フィールド定義はレイヤーを開き直すまで変わらないので1回だけ取得する
+        self._fields = self.original_layer.fields()
+        self._field_names = [self._fields.at(i).name() for i in range(self._fields.count())]
+        self._field_idx = {name: i for i, name in enumerate(self._field_names)}
+
         # 旧形式の _plans.sqlite があれば _data.sqlite にマイグレーション
         self._migrate_legacy_db(base)
 
+        # 管理用SQLiteは最初に必要になった時点で _db() が開き、以後は開いたままにする
+        # （読み込むだけのGPKGの横に管理用ファイルを作らない）
         return self.original_layer
 
     def _migrate_legacy_db(self, base):
@@ -112,54 +194,151 @@ class GpkgDataManager:
         """オリジナルレイヤーのフィールド名リストを返す。"""
         if not self.original_layer:
             return []
-        return [field.name() for field in self.original_layer.fields()]
+        return list(self._field_names)
 
     def get_intersecting_fids(self, geometry, crs=None):
         """指定ジオメトリと交差するフィーチャーのfidリストを返す。"""
         if not self.original_layer:
             return []
 
-        request = QgsFeatureRequest()
-        request.setFilterRect(geometry.boundingBox())
+        sindex = self._spatial_index()
+        if geometry.isMultipart():
+            # 離れた複数部分の外接矩形は空白部分が広いので、部分ごとの矩形で候補を絞る
+            candidates = list(dict.fromkeys(
+                fid
+                for part in geometry.constParts()
+                for fid in sindex.intersects(part.boundingBox())
+            ))
+        else:
+            candidates = sindex.intersects(geometry.boundingBox())
+        if not candidates:
+            return []
+        # 検索ジオメトリは1回だけ準備 (prepare) して全候補の判定に使い回す
+        engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+        engine.prepareGeometry()
+        return [
+            fid for fid in candidates
+            if engine.intersects(sindex.geometry(fid).constGet())
+        ]
+
+    def _spatial_index(self):
+        """ジオメトリを保持した空間インデックスを返す（初回のみ全件から構築）。"""
+        if self._sindex is None:
+            request = QgsFeatureRequest()
+            request.setNoAttributes()
+            self._sindex = QgsSpatialIndex(
+                self.original_layer.getFeatures(request),
+                flags=QgsSpatialIndex.FlagStoreFeatureGeometries,
+            )
+        return self._sindex
 
-        fids = []
-        for feat in self.original_layer.getFeatures(request):
-            if feat.geometry().intersects(geometry):
-                fids.append(feat.id())
-        return fids
+    def invalidate_spatial_index(self):
+        """空間インデックスを破棄する。次回の交差検索時に再構築される。"""
+        self._sindex = None
 
     def get_merged_features(self, fids, display_cols, edit_cols, plan_name):
         """結合済みデータを返す。"""
         if not self.original_layer:
             return []
 
-        all_cols = display_cols + edit_cols
-        edit_data = self._load_edit_data(fids, edit_cols, plan_name)
-
-        result = []
         request = QgsFeatureRequest()
         request.setFilterFids(fids)
+        return list(self._iter_merged(request, display_cols, edit_cols, plan_name))
 
-        for feat in self.original_layer.getFeatures(request):
-            fid = feat.id()
-            row = {'fid': fid}
-            for col in all_cols:
-                idx = self.original_layer.fields().indexOf(col)
-                if idx >= 0:
-                    row[col] = feat.attribute(idx)
-                else:
-                    row[col] = None
+    def prepare_merged_fetch(self, fids, display_cols, edit_cols, plan_name):
+        """get_merged_features と同じ結果を別スレッドで作る関数を返す。
+
+        レイヤーと管理用SQLiteの接続はスレッド間で共有できないため、
+        フィーチャーソースを GUI スレッドで複製し、関数内では専用の接続を開く。
+        レイヤーの切り替えで変わる属性（フィールド番号・DBパス）も作成時の値を
+        ローカルに保持し、関数内では self の状態を参照しない。
+        """
+        if not self.original_layer:
+            return lambda: []
+        self.flush_edits()  # バッファ中の編集を別接続からも読めるようにする
+        source = QgsVectorLayerFeatureSource(self.original_layer)
+        field_idx = dict(self._field_idx)
+        db_path = self._db_path
+        fids = list(fids)
+        display_cols = list(display_cols)
+        edit_cols = list(edit_cols)
+
+        if not (db_path and plan_name and edit_cols and os.path.exists(db_path)):
+            # 編集データがない（管理用DBを作らず、計画名なしとして結合する）
+            db_path = plan_name = None
+
+        def fetch():
+            conn = sqlite3.connect(db_path) if db_path else None
+            try:
+                request = QgsFeatureRequest()
+                request.setFilterFids(fids)
+                return list(self._iter_merged(
+                    request, display_cols, edit_cols, plan_name,
+                    source=source, conn=conn, field_idx=field_idx,
+                ))
+            finally:
+                if conn is not None:
+                    conn.close()
 
-            edited_cols = set()
-            if fid in edit_data:
-                for col in edit_cols:
-                    if col in edit_data[fid]:
-                        row[col] = edit_data[fid][col]
-                        edited_cols.add(col)
-            row['_edited_cols'] = edited_cols
+        return fetch
 
-            result.append(row)
-        return result
+    def _iter_merged(self, request, display_cols, edit_cols, plan_name,
+                     source=None, conn=None, field_idx=None):
+        """request のフィーチャーを1パスで読みながら編集データを結合した行を返すジェネレータ。
+
+        編集データは MERGE_BATCH_SIZE 件ごとにまとめて読み込む。
+        source / conn / field_idx を渡すとオリジナルレイヤー・常設接続・
+        フィールド番号の対応表の代わりに使う（別スレッドからの読み込み用）。
+        """
+        all_cols = display_cols + edit_cols
+
+        # カラム名→フィールド番号はループ外で1回だけ解決し、必要な属性だけ取得する
+        if field_idx is None:
+            field_idx = self._field_idx
+        col_idxs = [(col, field_idx.get(col, -1)) for col in all_cols]
+        request.setSubsetOfAttributes([idx for _, idx in col_idxs if idx >= 0])
+        # 属性だけを返すのでジオメトリは読み込まない
+        request.setFlags(request.flags() | QgsFeatureRequest.NoGeometry)
+
+        if source is None:
+            source = self.original_layer
+        batch = []
+        for feat in source.getFeatures(request):
+            fid = feat.id()
+            attrs = feat.attributes()
+            row = {'fid': fid}
+            for col, idx in col_idxs:
+                row[col] = attrs[idx] if idx >= 0 else None
+            batch.append(row)
+            if len(batch) >= MERGE_BATCH_SIZE:
+                yield from self._apply_edits(batch, edit_cols, plan_name, conn)
+                batch = []
+        if batch:
+            yield from self._apply_edits(batch, edit_cols, plan_name, conn)
+
+    def _apply_edits(self, rows, edit_cols, plan_name, conn=None):
+        """行リストに編集データを上書きし、_edited_cols を付けて返す。
+
+        編集のない行の _edited_cols は共有の空 frozenset になる。
+        """
+        edit_data = self._load_edit_data(
+            [row['fid'] for row in rows], edit_cols, plan_name, conn
+        )
+        if not edit_data:
+            for row in rows:
+                row['_edited_cols'] = _NO_EDITS
+            return rows
+        edit_cols_set = set(edit_cols)
+        for row in rows:
+            edits = edit_data.get(row['fid'])
+            if edits:
+                edited_cols = edits.keys() & edit_cols_set
+                for col in edited_cols:
+                    row[col] = edits[col]
+                row['_edited_cols'] = edited_cols
+            else:
+                row['_edited_cols'] = _NO_EDITS
+        return rows
 
     # ──────────────────────────────────────────────
     # 管理用SQLite (計画 + 編集データ)
@@ -172,6 +351,11 @@ class GpkgDataManager:
         conn = sqlite3.connect(self._db_path)
         # WALモードを無効化（Windows環境で.shm/.walが残存しロックされる問題を回避）
         conn.execute('PRAGMA journal_mode=DELETE')
+        # コミットごとの fsync を減らす（ジャーナル書き込み時の同期を省略）
+        conn.execute('PRAGMA synchronous=NORMAL')
+        # 一時テーブル (fid 絞り込み用) はメモリ上に置き、ページキャッシュを 64MiB にする
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')
         conn.execute('''
             CREATE TABLE IF NOT EXISTS plans (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -181,15 +365,7 @@ class GpkgDataManager:
                 status_exprs TEXT
             )
         ''')
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS edits (
-                plan_name TEXT NOT NULL,
-                orig_fid INTEGER NOT NULL,
-                col_name TEXT NOT NULL,
-                value,
-                PRIMARY KEY (plan_name, orig_fid, col_name)
-            )
-        ''')
+        conn.execute(_EDITS_DDL.format(name='edits'))
         # edits テーブルのスキーママイグレーション（plan_name カラム追加）
         try:
             cols = [r[1] for r in conn.execute('PRAGMA table_info(edits)').fetchall()]
@@ -205,15 +381,7 @@ class GpkgDataManager:
                     except Exception:  # nosec B110
                         pass
                 conn.execute('DROP TABLE edits')
-                conn.execute('''
-                    CREATE TABLE edits (
-                        plan_name TEXT NOT NULL,
-                        orig_fid INTEGER NOT NULL,
-                        col_name TEXT NOT NULL,
-                        value,
-                        PRIMARY KEY (plan_name, orig_fid, col_name)
-                    )
-                ''')
+                conn.execute(_EDITS_DDL.format(name='edits'))
                 for orig_fid, col_name, value in old_edits:
                     for pname, fids in plan_fids.items():
                         if orig_fid in fids:
@@ -226,6 +394,23 @@ class GpkgDataManager:
                 conn.commit()
         except Exception:  # nosec B110
             pass
+        # edits テーブルのスキーママイグレーション（WITHOUT ROWID 化）
+        try:
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type='table' AND name='edits'"
+            ).fetchone()
+            if row and 'WITHOUT ROWID' not in row[0].upper():
+                with conn:
+                    conn.execute('DROP TABLE IF EXISTS edits_new')
+                    conn.execute(_EDITS_DDL.format(name='edits_new'))
+                    conn.execute(
+                        'INSERT INTO edits_new (plan_name, orig_fid, col_name, value) '
+                        'SELECT plan_name, orig_fid, col_name, value FROM edits'
+                    )
+                    conn.execute('DROP TABLE edits')
+                    conn.execute('ALTER TABLE edits_new RENAME TO edits')
+        except Exception:  # nosec B110
+            pass
         conn.execute('''
             CREATE TABLE IF NOT EXISTS export_history (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -249,110 +434,213 @@ class GpkgDataManager:
         conn.commit()
         return conn
 
+    def _db(self):
+        """管理用SQLiteの常設接続を返す（未接続なら開く）。"""
+        if self._conn is None:
+            self._conn = self._open_db()
+        return self._conn
+
+    def _existing_db(self):
+        """管理用SQLiteがあればその接続を返す（なければ None。ファイルは作らない）。
+
+        読み込むだけの処理ではこちらを使い、書き込みがあるまでファイルを作成しない。
+        """
+        if self._conn is None and not (self._db_path and os.path.exists(self._db_path)):
+            return None
+        return self._db()
+
+    def _close_db(self):
+        """未書き込みの編集を反映して管理用SQLiteの接続を閉じる。"""
+        self.flush_edits()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
     # ──────────────────────────────────────────────
     # 編集データ
     # ──────────────────────────────────────────────
 
-    def _load_edit_data(self, fids, edit_cols, plan_name):
+    def _load_edit_data(self, fids, edit_cols, plan_name, conn=None):
         """編集データを読み込む。"""
         edit_data = {}
-        if not self._db_path or not edit_cols or not fids or not plan_name:
+        if not edit_cols or not fids or not plan_name:
             return edit_data
-        if not os.path.exists(self._db_path):
+        if conn is None and not self._db_path:
             return edit_data
+        for orig_fid, col_name, value in self._query_edits(fids, plan_name, conn):
+            if col_name in edit_cols:
+                edit_data.setdefault(orig_fid, {})[col_name] = value
+        return edit_data
 
-        conn = sqlite3.connect(self._db_path)
+    def _query_edits(self, fids, plan_name, conn=None):
+        """指定fidsの編集データ (orig_fid, col_name, value) のリストを返す。
+
+        fid数が多くても変数上限に掛からないよう、一時テーブルに入れて JOIN する。
+        conn を渡した場合（別スレッドからの読み込み）はバッファを書き込まずにその接続で読む。
+        """
+        if conn is None:
+            self.flush_edits()
+            conn = self._existing_db()
+        if not conn:
+            return []
         try:
-            placeholders = ','.join('?' for _ in fids)
-            rows = conn.execute(
-                f'SELECT orig_fid, col_name, value FROM edits '  # nosec B608
-                f'WHERE plan_name = ? AND orig_fid IN ({placeholders})',
-                [plan_name] + list(fids),
-            ).fetchall()
-            for orig_fid, col_name, value in rows:
-                if col_name in edit_cols:
-                    if orig_fid not in edit_data:
-                        edit_data[orig_fid] = {}
-                    edit_data[orig_fid][col_name] = value
+            with conn:
+                conn.execute('CREATE TEMP TABLE IF NOT EXISTS _qfids (fid INTEGER PRIMARY KEY)')
+                conn.execute('DELETE FROM _qfids')
+                conn.executemany(
+                    'INSERT OR IGNORE INTO _qfids (fid) VALUES (?)',
+                    ((fid,) for fid in fids),
+                )
+                return conn.execute(
+                    'SELECT e.orig_fid, e.col_name, e.value '
+                    'FROM _qfids q JOIN edits e '
+                    'ON e.plan_name = ? AND e.orig_fid = q.fid',
+                    (plan_name,),
+                ).fetchall()
         except sqlite3.OperationalError:
-            pass
-        finally:
-            conn.close()
-        return edit_data
+            return []
 
     def get_all_edits(self, plan_name):
         """指定計画の全編集データを返す: {orig_fid: {col_name: value}}"""
-        if not self._db_path or not os.path.exists(self._db_path) or not plan_name:
+        if not self._db_path or not plan_name:
+            return {}
+        self.flush_edits()
+        conn = self._existing_db()
+        if not conn:
             return {}
-        conn = sqlite3.connect(self._db_path)
         try:
             rows = conn.execute(
                 'SELECT orig_fid, col_name, value FROM edits WHERE plan_name = ?',
                 (plan_name,),
             ).fetchall()
-            result = {}
-            for orig_fid, col_name, value in rows:
-                if orig_fid not in result:
-                    result[orig_fid] = {}
-                result[orig_fid][col_name] = value
-            return result
         except sqlite3.OperationalError:
             return {}
-        finally:
-            conn.close()
+        result = {}
+        for orig_fid, col_name, value in rows:
+            if orig_fid not in result:
+                result[orig_fid] = {}
+            result[orig_fid][col_name] = value
+        return result
+
+    def has_edits(self, plan_name, cols):
+        """指定計画に指定カラムの編集データが1件でもあるかを返す。"""
+        if not self._db_path or not plan_name or not cols:
+            return False
+        self.flush_edits()
+        conn = self._existing_db()
+        if not conn:
+            return False
+        cols = list(cols)
+        placeholders = ','.join('?' * len(cols))
+        try:
+            row = conn.execute(
+                f'SELECT 1 FROM edits WHERE plan_name = ? AND col_name IN ({placeholders}) LIMIT 1',  # nosec B608
+                [plan_name] + cols,
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return False
+        return row is not None
 
     def clear_edits(self, plan_name):
         """指定計画の編集データをクリアする（上書き保存後に呼ぶ）。"""
-        conn = self._open_db()
+        self.flush_edits()
+        conn = self._db()
         if not conn:
             return
-        try:
+        with conn:
             conn.execute('DELETE FROM edits WHERE plan_name = ?', (plan_name,))
-            conn.commit()
-        finally:
-            conn.close()
 
-    def save_edit(self, fid, column, value, edit_cols, plan_name):
-        """編集データを保存する。"""
+    def save_edit(self, fid, column, value, plan_name):
+        """編集データを書き込みバッファに積む。
+
+        同じセルへの連続した編集は最後の値だけが残る。実際の書き込みは
+        最後の編集から EDIT_FLUSH_DELAY_MS 後に flush_edits でまとめて行い、
+        確定した編集は flushed_callback に渡す。
+        """
         if not plan_name:
             raise ValueError('計画名が指定されていません')
-        conn = self._open_db()
-        if not conn:
+        if not self._db_path:
             raise ValueError('管理用DBを開けません')
-        try:
-            conn.execute(
+        self._edit_buffer[(plan_name, fid, column)] = value
+        self._flush_timer.start(EDIT_FLUSH_DELAY_MS)
+        return True
+
+    def save_edits_bulk(self, edits, plan_name):
+        """複数の編集データ [(fid, col_name, value), ...] を1トランザクションで書き込む。"""
+        if not plan_name:
+            raise ValueError('計画名が指定されていません')
+        if not self._db_path:
+            raise ValueError('管理用DBを開けません')
+        for fid, column, value in edits:
+            self._edit_buffer[(plan_name, fid, column)] = value
+        self.flush_edits()
+        return True
+
+    def flush_edits(self):
+        """バッファ中の編集データを1トランザクションで書き込む。
+
+        書き込みに失敗した場合（DBのロック・容量不足など）はバッファを残したまま
+        sqlite3.Error を送出し、次回の書き込みで再試行できるようにする。
+        書き込みが確定した編集は flushed_callback に渡す。
+        """
+        self._flush_timer.stop()
+        if not self._edit_buffer:
+            return
+        conn = self._db()
+        if not conn:
+            return
+        with conn:
+            conn.executemany(
                 'INSERT OR REPLACE INTO edits (plan_name, orig_fid, col_name, value) '
                 'VALUES (?, ?, ?, ?)',
-                (plan_name, fid, column, value),
+                [(plan, fid, col, value)
+                 for (plan, fid, col), value in self._edit_buffer.items()],
             )
-            conn.commit()
-            return True
-        finally:
-            conn.close()
+        # 書き込みが確定してからバッファを空にする
+        flushed, self._edit_buffer = self._edit_buffer, {}
+        if self._flushed_callback:
+            self._flushed_callback(
+                [(plan, fid, col, value) for (plan, fid, col), value in flushed.items()]
+            )
+
+    def _on_flush_timer(self):
+        """タイマーによる遅延書き込み。
+
+        失敗は Qt のスロット外に送出せずログに残し、flush_failed_callback に渡す。
+        """
+        try:
+            self.flush_edits()
+        except sqlite3.Error as e:
+            QgsMessageLog.logMessage(
+                f'編集データの書き込みに失敗しました（未保存の編集 {len(self._edit_buffer)} 件は'
+                f'次回の書き込みで再試行します）: {e}',
+                'GPKG Editor', Qgis.Critical
+            )
+            if self._flush_failed_callback:
+                self._flush_failed_callback(e)
 
     # ──────────────────────────────────────────────
     # 計画管理
     # ──────────────────────────────────────────────
 
     def list_plans(self):
-        if not self._db_path or not os.path.exists(self._db_path):
+        conn = self._existing_db()
+        if not conn:
             return []
-        conn = sqlite3.connect(self._db_path)
         try:
             rows = conn.execute(
                 'SELECT name FROM plans ORDER BY name'
             ).fetchall()
-            return [r[0] for r in rows]
         except sqlite3.OperationalError:
             return []
-        finally:
-            conn.close()
+        return [r[0] for r in rows]
 
     def save_plan(self, name, fids, column_config, status_exprs=None):
-        conn = self._open_db()
+        self.flush_edits()
+        conn = self._db()
         if not conn:
             return False
-        try:
+        with conn:
             conn.execute(
                 'INSERT OR REPLACE INTO plans '
                 '(name, fids, column_config, status_exprs) '
@@ -360,47 +648,66 @@ class GpkgDataManager:
                 (name, json.dumps(fids), json.dumps(column_config),
                  json.dumps(status_exprs) if status_exprs else None),
             )
-            conn.commit()
-            return True
-        finally:
-            conn.close()
+        return True
 
-    def load_plan(self, name):
-        conn = self._open_db()
+    def append_plan_fids(self, name, fids):
+        """保存済み計画のフィーチャーセットの末尾に fid を追加する。
+
+        カラム設定・ステータス式は書き直さず、fid リストだけを読み込んで追記する。
+        読み込みから書き込みまでは1トランザクションで行う。
+        計画が保存されていなければ False を返す（呼び出し側で save_plan する）。
+        """
+        if not fids:
+            return True
+        conn = self._existing_db()
         if not conn:
-            return None
-        try:
+            return False
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
             row = conn.execute(
-                'SELECT fids, column_config, status_exprs FROM plans '
-                'WHERE name = ?',
-                (name,),
+                'SELECT fids FROM plans WHERE name = ?', (name,)
             ).fetchone()
             if not row:
-                return None
-            result = {
-                'fids': json.loads(row[0]),
-                'column_config': json.loads(row[1]),
-            }
-            if row[2]:
-                result['status_exprs'] = json.loads(row[2])
-            else:
-                result['status_exprs'] = {}
-            return result
-        finally:
-            conn.close()
+                return False
+            stored = json.loads(row[0])
+            stored.extend(fids)
+            conn.execute(
+                'UPDATE plans SET fids = ? WHERE name = ?',
+                (json.dumps(stored), name),
+            )
+        return True
+
+    def load_plan(self, name):
+        conn = self._existing_db()
+        if not conn:
+            return None
+        row = conn.execute(
+            'SELECT fids, column_config, status_exprs FROM plans '
+            'WHERE name = ?',
+            (name,),
+        ).fetchone()
+        if not row:
+            return None
+        result = {
+            'fids': json.loads(row[0]),
+            'column_config': json.loads(row[1]),
+        }
+        if row[2]:
+            result['status_exprs'] = json.loads(row[2])
+        else:
+            result['status_exprs'] = {}
+        return result
 
     def delete_plan(self, name):
-        conn = self._open_db()
+        self.flush_edits()
+        conn = self._db()
         if not conn:
             return False
-        try:
+        with conn:
             conn.execute('DELETE FROM edits WHERE plan_name = ?', (name,))
             conn.execute('DELETE FROM plans WHERE name = ?', (name,))
             conn.execute('DELETE FROM export_history WHERE plan_name = ?', (name,))
-            conn.commit()
-            return True
-        finally:
-            conn.close()
+        return True
 
     def copy_plan(self, source_name, new_name):
         """計画をコピーする（フィーチャーセット・カラム設定・編集データをすべてコピー）。"""
@@ -415,24 +722,17 @@ class GpkgDataManager:
         ):
             return False
         # 編集データもコピー（計画ごとに独立した編集値を持つ）
-        conn = self._open_db()
+        self.flush_edits()
+        conn = self._db()
         if not conn:
             return True  # 計画自体は保存済み
-        try:
-            rows = conn.execute(
-                'SELECT orig_fid, col_name, value FROM edits WHERE plan_name = ?',
-                (source_name,),
-            ).fetchall()
-            for orig_fid, col_name, value in rows:
-                conn.execute(
-                    'INSERT OR IGNORE INTO edits (plan_name, orig_fid, col_name, value) '
-                    'VALUES (?, ?, ?, ?)',
-                    (new_name, orig_fid, col_name, value),
-                )
-            conn.commit()
-            return True
-        finally:
-            conn.close()
+        with conn:
+            conn.execute(
+                'INSERT OR IGNORE INTO edits (plan_name, orig_fid, col_name, value) '
+                'SELECT ?, orig_fid, col_name, value FROM edits WHERE plan_name = ?',
+                (new_name, source_name),
+            )
+        return True
 
     # ──────────────────────────────────────────────
     # エクスポート / ユーティリティ
@@ -443,32 +743,15 @@ class GpkgDataManager:
         if not self.original_layer:
             return []
 
-        all_fids = [f.id() for f in self.original_layer.getFeatures()]
-        return self.get_merged_features(all_fids, display_cols, edit_cols, plan_name)
+        return list(self._iter_merged(QgsFeatureRequest(), display_cols, edit_cols, plan_name))
 
     def _load_all_edit_data(self, fids, plan_name):
         """指定fidsの全カラム編集データを読み込む（カラム絞り込みなし）。"""
         edit_data = {}
         if not self._db_path or not fids or not plan_name:
             return edit_data
-        if not os.path.exists(self._db_path):
-            return edit_data
-        conn = sqlite3.connect(self._db_path)
-        try:
-            placeholders = ','.join('?' for _ in fids)
-            rows = conn.execute(
-                f'SELECT orig_fid, col_name, value FROM edits '  # nosec B608
-                f'WHERE plan_name = ? AND orig_fid IN ({placeholders})',
-                [plan_name] + list(fids),
-            ).fetchall()
-            for orig_fid, col_name, value in rows:
-                if orig_fid not in edit_data:
-                    edit_data[orig_fid] = {}
-                edit_data[orig_fid][col_name] = value
-        except sqlite3.OperationalError:
-            pass
-        finally:
-            conn.close()
+        for orig_fid, col_name, value in self._query_edits(fids, plan_name):
+            edit_data.setdefault(orig_fid, {})[col_name] = value
         return edit_data
 
     def export_gpkg(self, output_path, plan_name, fids=None):
@@ -476,46 +759,56 @@ class GpkgDataManager:
         if not self.original_layer:
             return False
 
-        fields = self.original_layer.fields()
-        all_cols = [fields.at(i).name() for i in range(fields.count())]
+        fields = self._fields
+        field_idx = self._field_idx
 
         request = QgsFeatureRequest()
         if fids is not None:
             request.setFilterFids(fids)
             edit_data = self._load_all_edit_data(fids, plan_name)
         else:
-            all_fids = [f.id() for f in self.original_layer.getFeatures()]
-            edit_data = self._load_all_edit_data(all_fids, plan_name)
+            # 全件出力では fid を列挙せず、計画の編集データをそのまま使う
+            edit_data = self.get_all_edits(plan_name)
 
         writer_options = QgsVectorFileWriter.SaveVectorOptions()
         writer_options.driverName = 'GPKG'
         writer_options.fileEncoding = 'UTF-8'
 
         transform_context = QgsProject.instance().transformContext()
-        writer = QgsVectorFileWriter.create(
-            output_path,
-            fields,
-            self.original_layer.wkbType(),
-            self.original_layer.crs(),
-            transform_context,
-            writer_options,
-        )
-
-        if writer.hasError() != QgsVectorFileWriter.NoError:
-            raise IOError(f'GPKGライターの初期化に失敗しました: {writer.errorMessage()}')
-
-        for orig_feat in self.original_layer.getFeatures(request):
-            fid = orig_feat.id()
-            new_feat = QgsFeature(fields)
-            new_feat.setGeometry(orig_feat.geometry())
-            for col_name in all_cols:
-                if fid in edit_data and col_name in edit_data[fid]:
-                    new_feat.setAttribute(col_name, edit_data[fid][col_name])
-                else:
-                    new_feat.setAttribute(col_name, orig_feat.attribute(col_name))
-            writer.addFeature(new_feat)
+        with _gdal_config(EXPORT_GDAL_OPTIONS):
+            writer = QgsVectorFileWriter.create(
+                output_path,
+                fields,
+                self.original_layer.wkbType(),
+                self.original_layer.crs(),
+                transform_context,
+                writer_options,
+            )
 
-        del writer
+            if writer.hasError() != QgsVectorFileWriter.NoError:
+                raise IOError(f'GPKGライターの初期化に失敗しました: {writer.errorMessage()}')
+
+            # EXPORT_CHUNK_SIZE 件ずつまとめて addFeatures で書き込む
+            chunk = []
+            for orig_feat in self.original_layer.getFeatures(request):
+                fid = orig_feat.id()
+                new_feat = QgsFeature(fields)
+                new_feat.setGeometry(orig_feat.geometry())
+                attrs = orig_feat.attributes()
+                if fid in edit_data:
+                    for col_name, value in edit_data[fid].items():
+                        idx = field_idx.get(col_name)
+                        if idx is not None:
+                            attrs[idx] = value
+                new_feat.setAttributes(attrs)
+                chunk.append(new_feat)
+                if len(chunk) >= EXPORT_CHUNK_SIZE:
+                    writer.addFeatures(chunk)
+                    chunk = []
+            if chunk:
+                writer.addFeatures(chunk)
+
+            del writer
         return True
 
     def export_csv(self, output_path, plan_name, fids=None):
@@ -523,30 +816,38 @@ class GpkgDataManager:
         if not self.original_layer:
             return False
 
-        fields = self.original_layer.fields()
-        all_cols = [fields.at(i).name() for i in range(fields.count())]
+        all_cols = self._field_names
+        field_idx = self._field_idx
 
         request = QgsFeatureRequest()
+        request.setFlags(QgsFeatureRequest.NoGeometry)  # CSVにジオメトリは出力しない
         if fids is not None:
             request.setFilterFids(fids)
             edit_data = self._load_all_edit_data(fids, plan_name)
         else:
-            all_fids = [f.id() for f in self.original_layer.getFeatures()]
-            edit_data = self._load_all_edit_data(all_fids, plan_name)
+            # 全件出力では fid を列挙せず、計画の編集データをそのまま使う
+            edit_data = self.get_all_edits(plan_name)
 
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        with open(output_path, 'w', newline='', encoding='utf-8',
+                  buffering=CSV_WRITE_BUFFER) as f:
             writer = csv.writer(f)
             writer.writerow(all_cols)
+            # CSV_CHUNK_SIZE 行ずつまとめて writerows で書き込む
+            chunk = []
             for feat in self.original_layer.getFeatures(request):
                 fid = feat.id()
-                row = []
-                for col_name in all_cols:
-                    if fid in edit_data and col_name in edit_data[fid]:
-                        row.append(edit_data[fid][col_name])
-                    else:
-                        val = feat.attribute(col_name)
-                        row.append(val if val is not None else '')
-                writer.writerow(row)
+                row = [val if val is not None else '' for val in feat.attributes()]
+                if fid in edit_data:
+                    for col_name, value in edit_data[fid].items():
+                        idx = field_idx.get(col_name)
+                        if idx is not None:
+                            row[idx] = value
+                chunk.append(row)
+                if len(chunk) >= CSV_CHUNK_SIZE:
+                    writer.writerows(chunk)
+                    chunk = []
+            if chunk:
+                writer.writerows(chunk)
         return True
 
     # ──────────────────────────────────────────────
@@ -556,12 +857,12 @@ class GpkgDataManager:
     def save_export_history(self, plan_name, filename, file_type,
                             feature_count, edited_col_count, author=''):
         """エクスポート結果を export_history に記録する。"""
-        conn = self._open_db()
+        conn = self._db()
         if not conn:
             return None
-        try:
-            from datetime import datetime
-            exported_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        from datetime import datetime
+        exported_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with conn:
             cur = conn.execute(
                 'INSERT INTO export_history '
                 '(plan_name, exported_at, filename, file_type, '
@@ -570,16 +871,13 @@ class GpkgDataManager:
                 (plan_name, exported_at, filename, file_type,
                  feature_count, edited_col_count, author, ''),
             )
-            conn.commit()
-            return cur.lastrowid
-        finally:
-            conn.close()
+        return cur.lastrowid
 
     def list_export_history(self, plan_name):
         """エクスポート履歴を新しい順で返す（削除済みフラグも含む）。"""
-        if not self._db_path or not os.path.exists(self._db_path):
+        conn = self._existing_db()
+        if not conn:
             return []
-        conn = sqlite3.connect(self._db_path)
         try:
             rows = conn.execute(
                 'SELECT id, exported_at, filename, file_type, '
@@ -588,49 +886,41 @@ class GpkgDataManager:
                 'ORDER BY exported_at DESC',
                 (plan_name,),
             ).fetchall()
-            return [
-                {'id': r[0], 'exported_at': r[1], 'filename': r[2],
-                 'file_type': r[3], 'feature_count': r[4],
-                 'edited_col_count': r[5], 'author': r[6] or '',
-                 'memo': r[7] or '', 'is_deleted': bool(r[8])}
-                for r in rows
-            ]
         except sqlite3.OperationalError:
             return []
-        finally:
-            conn.close()
+        return [
+            {'id': r[0], 'exported_at': r[1], 'filename': r[2],
+             'file_type': r[3], 'feature_count': r[4],
+             'edited_col_count': r[5], 'author': r[6] or '',
+             'memo': r[7] or '', 'is_deleted': bool(r[8])}
+            for r in rows
+        ]
 
     def update_export_history_field(self, record_id, field, value):
         """author または memo フィールドを更新する。"""
         if field not in ('author', 'memo'):
             return False
-        conn = self._open_db()
+        conn = self._db()
         if not conn:
             return False
-        try:
+        with conn:
             conn.execute(
                 f'UPDATE export_history SET {field} = ? WHERE id = ?',  # nosec B608
                 (value, record_id),
             )
-            conn.commit()
-            return True
-        finally:
-            conn.close()
+        return True
 
     def delete_export_history(self, record_id):
         """エクスポート履歴レコードをソフトデリート（is_deleted=1）する。"""
-        conn = self._open_db()
+        conn = self._db()
         if not conn:
             return False
-        try:
+        with conn:
             conn.execute(
                 'UPDATE export_history SET is_deleted = 1 WHERE id = ?',
                 (record_id,),
             )
-            conn.commit()
-            return True
-        finally:
-            conn.close()
+        return True
 
     def migrate_old_filename_pattern(self, export_folder):
         """旧命名パターン {計画名}_{レイヤー名}_{番号}_{日付}_{時間}.{拡張子} のファイルを
@@ -638,11 +928,10 @@ class GpkgDataManager:
         ファイルのリネームと export_history レコードの filename 更新を行う。
         Returns: {旧ファイル名: 新ファイル名} の辞書（変更があったもののみ）
         """
-        if not self._db_path or not os.path.exists(self._db_path):
+        conn = self._existing_db()
+        if not conn:
             return {}
 
-        conn = sqlite3.connect(self._db_path)
-        conn.execute('PRAGMA journal_mode=DELETE')
         renamed = {}
         try:
             rows = conn.execute(
@@ -694,9 +983,7 @@ class GpkgDataManager:
             if renamed:
                 conn.commit()
         except Exception:  # nosec B110
-            pass
-        finally:
-            conn.close()
+            conn.rollback()
 
         return renamed
 
@@ -705,50 +992,63 @@ class GpkgDataManager:
         - edits: plans テーブルに存在しない plan_name のレコードを削除
         - export_history: plans テーブルに存在しない plan_name のレコードを削除
         """
-        conn = self._open_db()
+        self.flush_edits()
+        conn = self._existing_db()
         if not conn:
             return
         try:
-            plan_names = {
-                row[0] for row in
-                conn.execute('SELECT name FROM plans').fetchall()
-            }
-
-            # edits: 存在しない計画名のレコードを削除
-            edit_plan_names = {
-                row[0] for row in
-                conn.execute('SELECT DISTINCT plan_name FROM edits').fetchall()
-            }
-            orphan_edit_plans = list(edit_plan_names - plan_names)
-            if orphan_edit_plans:
-                placeholders = ','.join('?' for _ in orphan_edit_plans)
-                conn.execute(
-                    f'DELETE FROM edits WHERE plan_name IN ({placeholders})',  # nosec B608
-                    orphan_edit_plans,
-                )
-
-            # export_history: 存在しない計画名のレコードを削除
-            history_names = {
-                row[0] for row in
-                conn.execute('SELECT DISTINCT plan_name FROM export_history').fetchall()
-            }
-            orphan_names = list(history_names - plan_names)
-            if orphan_names:
-                placeholders = ','.join('?' for _ in orphan_names)
-                conn.execute(
-                    f'DELETE FROM export_history WHERE plan_name IN ({placeholders})',  # nosec B608
-                    orphan_names,
-                )
+            with conn:
+                plan_names = {
+                    row[0] for row in
+                    conn.execute('SELECT name FROM plans').fetchall()
+                }
+
+                # edits: 存在しない計画名のレコードを削除
+                edit_plan_names = {
+                    row[0] for row in
+                    conn.execute('SELECT DISTINCT plan_name FROM edits').fetchall()
+                }
+                orphan_edit_plans = list(edit_plan_names - plan_names)
+                if orphan_edit_plans:
+                    placeholders = ','.join('?' for _ in orphan_edit_plans)
+                    conn.execute(
+                        f'DELETE FROM edits WHERE plan_name IN ({placeholders})',  # nosec B608
+                        orphan_edit_plans,
+                    )
 
-            if orphan_edit_plans or orphan_names:
-                conn.commit()
+                # export_history: 存在しない計画名のレコードを削除
+                history_names = {
+                    row[0] for row in
+                    conn.execute('SELECT DISTINCT plan_name FROM export_history').fetchall()
+                }
+                orphan_names = list(history_names - plan_names)
+                if orphan_names:
+                    placeholders = ','.join('?' for _ in orphan_names)
+                    conn.execute(
+                        f'DELETE FROM export_history WHERE plan_name IN ({placeholders})',  # nosec B608
+                        orphan_names,
+                    )
         except Exception:  # nosec B110
             pass
-        finally:
-            conn.close()
 
     def close(self):
-        """レイヤーを閉じる。"""
+        """レイヤーと管理用SQLiteを閉じる。"""
+        try:
+            self._close_db()
+        except sqlite3.Error as e:
+            QgsMessageLog.logMessage(
+                f'編集データの書き込みに失敗したため、未保存の編集 {len(self._edit_buffer)} 件を'
+                f'破棄しました: {e}',
+                'GPKG Editor', Qgis.Critical
+            )
+            self._edit_buffer = {}
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self._sindex = None
+        self._fields = None
+        self._field_names = []
+        self._field_idx = {}
         self.original_layer = None
         self.original_path = None
         self._db_path = None
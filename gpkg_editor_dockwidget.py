@@ -2,7 +2,9 @@
 import os
 import re
 import sip
+import sqlite3
 from datetime import datetime
+from functools import lru_cache
 
 from qgis.PyQt import uic
 from qgis.PyQt.QtWidgets import (
@@ -21,14 +23,15 @@ from qgis.PyQt.QtWidgets import (
     QScrollArea,
     QSizePolicy,
     QSplitter,
-    QTableWidgetItem,
     QMessageBox,
     QHeaderView,
     QVBoxLayout,
     QWidget,
 )
-from qgis.PyQt.QtCore import Qt, QEvent, QItemSelection, QItemSelectionModel, QTimer, QUrl
-from qgis.PyQt.QtGui import QColor, QBrush, QPainter, QPen, QPixmap, QDesktopServices
+from qgis.PyQt.QtCore import (
+    Qt, QEvent, QItemSelection, QItemSelectionModel, QThreadPool, QTimer, QUrl,
+)
+from qgis.PyQt.QtGui import QColor, QPainter, QPen, QPixmap, QDesktopServices
 from qgis.core import (
     QgsProject,
     QgsCoordinateTransform,
@@ -49,7 +52,9 @@ from qgis.core import (
 from qgis.gui import QgsRubberBand, QgsVertexMarker, QgsMapToolPan, QgsMapToolZoom
 
 from .gpkg_data_manager import GpkgDataManager
-from .status_expression import evaluate_row_expr
+from .feature_table_model import FeatureTableModel
+from .feature_fetch_worker import FeatureFetchWorker
+from .status_expression import compile_expr, evaluate_row_expr
 from .column_config_dialog import (
     ColumnConfigDialog,
     COLUMN_HIDDEN,
@@ -62,9 +67,41 @@ FORM_CLASS, _ = uic.loadUiType(
     os.path.join(os.path.dirname(__file__), 'gpkg_editor_dockwidget_base.ui')
 )
 
-# テキスト色
-COLOR_EDITABLE = QBrush(QColor(0, 0, 255))   # 青: 編集可能（未編集）
-COLOR_EDITED = QBrush(QColor(255, 0, 0))      # 赤: 編集済み
+# テーブルの列幅の初期値（内容に合わせた自動調整は全行を走査するため行わない）
+TABLE_DEFAULT_SECTION_SIZE = 120
+TABLE_MIN_SECTION_SIZE = 100
+TABLE_MAX_SECTION_SIZE = 400
+TABLE_WIDTH_SAMPLE_ROWS = 50   # 列幅の見積もりに使う先頭行数
+TABLE_WIDTH_PADDING = 16
+
+# ステータス表示を更新するまでの待ち時間（ミリ秒、連続した選択変更をまとめる）
+STATUS_UPDATE_DELAY_MS = 16
+
+# 計画の自動保存をまとめて行うまでの待ち時間（ミリ秒）
+PLAN_SAVE_DELAY_MS = 500
+
+# 結合データを別スレッドで取得する最小フィーチャー数（これ未満は GUI スレッドで取得）
+ASYNC_FETCH_MIN_FEATURES = 2000
+
+
+@lru_cache(maxsize=256)
+def _parse_layer_source(source):
+    """レイヤーのソース文字列を (GPKGパス, 正規化パス, layername) に分解する。
+
+    選択変更のたびに同じソースを解析し直さないようキャッシュする。
+    """
+    parts = source.split('|')
+    layername = None
+    for part in parts[1:]:
+        if part.startswith('layername='):
+            layername = part[len('layername='):]
+            break
+    return parts[0], os.path.normpath(parts[0]), layername
+
+
+@lru_cache(maxsize=16)
+def _normpath(path):
+    return os.path.normpath(path)
 
 
 class GpkgEditorWindow(QWidget, FORM_CLASS):
@@ -119,25 +156,59 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         QTimer.singleShot(0, self._apply_shortcuts_closed_height)
 
         self.iface = iface
-        self.data_manager = GpkgDataManager()
+        self.data_manager = GpkgDataManager(
+            flushed_callback=self._on_edits_flushed,
+            flush_failed_callback=self._on_edit_flush_failed,
+        )
         self.column_config = {}
+        self._col_cfg_version = 0   # column_config を差し替えるたびに増やす
+        self._col_cache_ver = -1    # カラム種別キャッシュを作った時点の版
+        self._col_cache = None      # (display, edit, info, visible, edit_set)
         self._current_fids = []
-        self._editing = False
+        self._current_fids_set = set()  # _current_fids の所属判定用
         self._locked = False
         self._temp_layer = None
         self._syncing_selection = False
-        self._rubber_bands = []
+        self._rubber_bands = []  # 表示中の (ジオメトリ種別, ラバーバンド)
+        self._rubber_band_pool = {}  # ジオメトリ種別 → 非表示で待機中のラバーバンド
         self._vertex_markers = []
+        self._last_highlight = None  # 最後にハイライト表示した選択（同一選択の再描画を省く）
+        self._last_selection_sig = None  # 最後にテーブルへ反映した地図選択（同一選択の再構築を省く）
+        # テーブル選択変更は連続して発火するため、イベントループに戻ってから1回だけ反映する
+        self._highlight_timer = QTimer(self)
+        self._highlight_timer.setSingleShot(True)
+        self._highlight_timer.setInterval(0)
+        self._highlight_timer.timeout.connect(self._apply_table_selection)
+        # ステータス表示の更新も連続した要求をまとめて1回だけ行う
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(STATUS_UPDATE_DELAY_MS)
+        self._status_timer.timeout.connect(self._update_status_display)
+        # 計画の自動保存は連続した変更をまとめて1回だけ書き込む
+        self._pending_plan_save = None  # 保存待ちの計画名
+        self._plan_dirty = False  # 保存されていない変更（カラム設定など）があるか
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(PLAN_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._flush_plan_save)
+        # 大量フィーチャーの結合データは別スレッドで取得する（同時に1件のみ）
+        self._fetch_pool = QThreadPool(self)
+        self._fetch_pool.setMaxThreadCount(1)
+        self._fetch_job_id = 0
+        self._pending_fetch = None  # (ジョブID, 表示カラム, 編集カラム, 計画名, 開始時刻)
         self._plan_active = False
         self._active_plan_name = None
         self._temp_source_layer_id = None  # 一時レイヤーの元レイヤーID（再利用判定用）
-        self._status_expr1 = ''
-        self._status_expr2 = ''
+        self._set_status_exprs('', '')
         self._current_merged_data = []
         self._feature_add_mode = False  # フィーチャー追加フロー中かどうか
         self._copy_mode = False  # 計画コピーモード中かどうか
         # GPKGレイヤー一覧を初期化
-        self._refresh_layer_combo()
+        self._combo_refresh_pending = False
+        self._layer_combo_key = None  # コンボに表示中の (案内文, (レイヤーID, 名前) の並び)
+        self._plan_combo_key = None  # 計画コンボに表示中の (案内文, コピー項目名, 計画名の並び)
+        self._edit_watch_layer = None  # 編集終了を監視中のレイヤー（空間インデックス破棄用）
+        self._do_refresh_layer_combo()
 
         # シグナル接続
         self.cmbGpkgLayer.currentIndexChanged.connect(self._on_layer_selected)
@@ -156,7 +227,24 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         self.cmbPlan.currentIndexChanged.connect(self._on_plan_selected)
         self.btnStatusRow1.clicked.connect(self._on_status_row1_config)
         self.btnStatusRow2.clicked.connect(self._on_status_row2_config)
-        self.tableFeatures.cellChanged.connect(self._on_cell_changed)
+
+        # テーブルはモデル/ビューで表示（セルごとのアイテムを作らない）
+        self._table_model = FeatureTableModel(self)
+        self.tableFeatures.setModel(self._table_model)
+        self._table_model.valueEdited.connect(self._on_cell_changed)
+        self._table_model.valuesEdited.connect(self._on_cells_changed)
+        # ステータス式の集計結果は表示データが変わるまで使い回す
+        self._agg_cache = {}
+        self._data_version = 0  # 表示データが変わるたびに増やす
+        self._last_status_key = ()  # 最後にステータス表示した (行, 式1, 式2, データ版)。() は未表示
+        self._table_model.modelReset.connect(self._on_table_data_changed)
+        self._table_model.dataChanged.connect(lambda *_: self._on_table_data_changed())
+        self._table_model.rowsInserted.connect(lambda *_: self._on_table_data_changed())
+        self._table_model.rowsRemoved.connect(lambda *_: self._on_table_data_changed())
+        header = self.tableFeatures.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setMinimumSectionSize(TABLE_MIN_SECTION_SIZE)
+        header.setDefaultSectionSize(TABLE_DEFAULT_SECTION_SIZE)
 
         # 複数選択を有効化（セル編集を維持するため SelectItems のまま）
         self.tableFeatures.setSelectionMode(
@@ -173,9 +261,6 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         self.tableFeatures.selectionModel().selectionChanged.connect(
             self._on_table_selection_changed
         )
-        self.tableFeatures.selectionModel().currentRowChanged.connect(
-            lambda *_: self._update_status_display()
-        )
 
         # プロジェクトのレイヤー追加/削除を監視してコンボを自動更新
         QgsProject.instance().layersAdded.connect(self._refresh_layer_combo)
@@ -286,6 +371,9 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         self.lblLegendInfo.setText(self.tr('■ 情報（後列）'))
         self.btnHistory.setText(self.tr('履歴'))
         self._update_language_button()
+        # 言語の切り替え後は、選択行や式が同じでもステータス表示を作り直す
+        self._last_status_key = ()
+        self._status_timer.start()
         if self._history_mode:
             self._refresh_history_panel()
 
@@ -338,19 +426,21 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
                     if key == Qt.Key_Up:
                         target_row, target_col = 0, col
                     elif key == Qt.Key_Down:
-                        target_row, target_col = self.tableFeatures.rowCount() - 1, col
+                        target_row, target_col = self._table_model.rowCount() - 1, col
                     elif key == Qt.Key_Left:
                         target_row, target_col = row, 0
                     else:  # Key_Right
-                        target_row, target_col = row, self.tableFeatures.columnCount() - 1
+                        target_row, target_col = row, self._table_model.columnCount() - 1
                     if mods == (Qt.ControlModifier | Qt.ShiftModifier):
-                        target = self.tableFeatures.model().index(target_row, target_col)
+                        target = self._table_model.index(target_row, target_col)
                         sel = QItemSelection(current, target)
                         self.tableFeatures.selectionModel().select(
                             sel, QItemSelectionModel.ClearAndSelect
                         )
                     else:
-                        self.tableFeatures.setCurrentCell(target_row, target_col)
+                        self.tableFeatures.setCurrentIndex(
+                            self._table_model.index(target_row, target_col)
+                        )
                     return True
 
         # Enter キー → 編集開始/確定トグル
@@ -363,13 +453,9 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
                 else:
                     # 非編集中 → 編集開始
                     current = self.tableFeatures.currentIndex()
-                    if current.isValid():
-                        item = self.tableFeatures.item(
-                            current.row(), current.column()
-                        )
-                        if item and (item.flags() & Qt.ItemIsEditable):
-                            self.tableFeatures.editItem(item)
-                            return True
+                    if current.isValid() and (current.flags() & Qt.ItemIsEditable):
+                        self.tableFeatures.edit(current)
+                        return True
                 return False
 
         # 計画コピーモード中にポップアップが閉じた → キャンセル
@@ -394,7 +480,12 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
 
     def cleanup(self):
         """プラグイン終了時のリソース解放。unload から呼ばれる。"""
+        self._flush_plan_save()
         self._remove_temp_layer()
+        self._release_rubber_band_pool()
+        self._cancel_fetch()
+        self._fetch_pool.clear()
+        self._fetch_pool.waitForDone()
         try:
             self.iface.mapCanvas().selectionChanged.disconnect(
                 self._on_selection_changed
@@ -406,6 +497,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             QgsProject.instance().layersRemoved.disconnect(self._on_layers_removed)
         except TypeError:
             pass
+        self._watch_layer_edits(None)
         self.data_manager.close()
 
     # ──────────────────────────────────────────────
@@ -654,33 +746,61 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         if self._temp_layer_valid() and self._temp_layer.id() in layer_ids:
             self._clear_rubber_bands()
             self._temp_layer = None
-        self._refresh_layer_combo(layer_ids=layer_ids)
+        if self.cmbGpkgLayer.currentData() in layer_ids:
+            # 選択中のレイヤーが削除された場合は参照が残らないよう即座に更新する
+            self._do_refresh_layer_combo()
+        else:
+            self._refresh_layer_combo()
 
-    def _refresh_layer_combo(self, *_args, layer_ids=None):
-        """プロジェクト内のGPKGレイヤーでコンボボックスを更新する。"""
-        prev_id = self.cmbGpkgLayer.currentData()
+    def _refresh_layer_combo(self, *_args):
+        """コンボボックスの更新を予約する。
 
-        self.cmbGpkgLayer.blockSignals(True)
-        self.cmbGpkgLayer.clear()
-        self.cmbGpkgLayer.addItem(self.tr('-- 選択してください --'), None)
+        プロジェクト読み込み時などは layersAdded が連続して発火するため、
+        イベントループに戻ってから1回だけ更新する。
+        """
+        if self._combo_refresh_pending:
+            return
+        self._combo_refresh_pending = True
+        QTimer.singleShot(0, self._do_refresh_layer_combo)
+
+    def _do_refresh_layer_combo(self):
+        """プロジェクト内のGPKGレイヤーでコンボボックスを更新する。"""
+        self._combo_refresh_pending = False
 
         layer_tree = QgsProject.instance().layerTreeRoot()
-        restore_idx = 0
+        entries = []
         for layer in QgsProject.instance().mapLayers().values():
             if not isinstance(layer, QgsVectorLayer):
                 continue
-            # レイヤーツリー（パネル）に存在しないものは除外
-            # （他プラグインがレジストリ未削除のままツリーからだけ消した場合の対策）
-            if layer_tree.findLayer(layer.id()) is None:
+            # 拡張子判定は末尾5文字だけを小文字化して比較する
+            if layer.source().split('|', 1)[0][-5:].lower() != '.gpkg':
                 continue
             # プラグインが内部で作成した一時レイヤーは除外
             if layer.customProperty('gpkg_editor_temp'):
                 continue
-            src = layer.source().split('|')[0]
-            if not src.lower().endswith('.gpkg'):
+            layer_id = layer.id()
+            # レイヤーツリー（パネル）に存在しないものは除外
+            # （他プラグインがレジストリ未削除のままツリーからだけ消した場合の対策）
+            if layer_tree.findLayer(layer_id) is None:
                 continue
-            self.cmbGpkgLayer.addItem(layer.name(), layer.id())
-            if layer.id() == prev_id:
+            entries.append((layer_id, layer.name()))
+        placeholder = self.tr('-- 選択してください --')
+        # 表示言語が変わった場合も作り直すよう、翻訳済みの案内文も比較する
+        combo_key = (placeholder, tuple(entries))
+        if combo_key == self._layer_combo_key:
+            return  # GPKGレイヤーの構成が変わらなければ作り直さない
+        self._layer_combo_key = combo_key
+
+        prev_id = self.cmbGpkgLayer.currentData()
+
+        self.cmbGpkgLayer.blockSignals(True)
+        self.cmbGpkgLayer.clear()
+        self.cmbGpkgLayer.addItem(placeholder, None)
+
+        restore_idx = 0
+        for layer_id, name in entries:
+            self.cmbGpkgLayer.addItem(name, layer_id)
+            if layer_id == prev_id:
                 restore_idx = self.cmbGpkgLayer.count() - 1
 
         self.cmbGpkgLayer.setCurrentIndex(restore_idx)
@@ -691,6 +811,23 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         if restore_idx == 0 and prev_id is not None:
             self._on_layer_selected(0)
 
+    def _watch_layer_edits(self, layer):
+        """レイヤーの編集終了時に空間インデックスを破棄するよう監視先を切り替える。
+
+        交差検索の空間インデックスはジオメトリを保持しているため、
+        地物の編集が確定したら次回検索時に作り直させる。
+        """
+        if self._edit_watch_layer is not None:
+            try:
+                self._edit_watch_layer.editingStopped.disconnect(
+                    self.data_manager.invalidate_spatial_index
+                )
+            except (TypeError, RuntimeError):
+                pass  # 既に削除されたレイヤー
+        self._edit_watch_layer = layer
+        if layer is not None:
+            layer.editingStopped.connect(self.data_manager.invalidate_spatial_index)
+
     def _on_layer_selected(self, index):
         """コンボボックスでレイヤーが選択された時。"""
         # ロック・計画を解除
@@ -701,8 +838,9 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
 
         layer_id = self.cmbGpkgLayer.currentData()
         if not layer_id:
+            self._watch_layer_edits(None)
             self.data_manager.close()
-            self.column_config = {}
+            self._set_column_config({})
             self._clear_table()
             self.btnColumnConfig.setEnabled(False)
             self.btnExportGpkg.setEnabled(False)
@@ -719,20 +857,14 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         if not layer:
             return
 
-        src = layer.source()
-        parts = src.split('|')
-        gpkg_path = parts[0]
-        layername = None
-        for part in parts[1:]:
-            if part.startswith('layername='):
-                layername = part[len('layername='):]
-                break
+        gpkg_path, _, layername = _parse_layer_source(layer.source())
 
         try:
             self.data_manager.load_gpkg(gpkg_path, layername=layername)
-        except ValueError as e:
+        except (ValueError, sqlite3.Error) as e:
             QMessageBox.critical(self, self.tr('エラー'), str(e))
             return
+        self._watch_layer_edits(layer)
 
         # 旧命名パターンのファイルをマイグレーション
         export_folder = self._get_export_folder()
@@ -746,7 +878,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         self.lblStatus.setText(self.tr('読込完了: {}').format(layer.name()))
 
         columns = self.data_manager.get_original_fields()
-        self.column_config = {col: COLUMN_HIDDEN for col in columns}
+        self._set_column_config({col: COLUMN_HIDDEN for col in columns})
 
         self.btnColumnConfig.setEnabled(True)
         self.btnExportGpkg.setEnabled(True)
@@ -770,19 +902,21 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         columns = self.data_manager.get_original_fields()
         dlg = ColumnConfigDialog(columns, self.column_config, self)
         if dlg.exec_() == ColumnConfigDialog.Accepted:
-            self.column_config = dlg.get_config()
+            old_visible = frozenset(self._get_visible_cols())
+            old_edit = self._get_edit_col_set()
+            self._set_column_config(dlg.get_config())
             self._mark_plan_dirty()
             if self._get_visible_cols():
                 self.btnPlanSave.setText(self.tr('登録フィーチャーの確定'))
             if self._current_fids:
-                self._update_table(self._current_fids)
+                if self._can_reuse_table_rows(old_visible, old_edit):
+                    self._refresh_table_columns()
+                else:
+                    self._update_table(self._current_fids)
             else:
-                visible_cols = self._get_visible_cols()
-                self._editing = True
-                self.tableFeatures.setRowCount(0)
-                self.tableFeatures.setColumnCount(len(visible_cols))
-                self.tableFeatures.setHorizontalHeaderLabels(visible_cols)
-                self._editing = False
+                self._table_model.set_data(
+                    [], self._get_visible_cols(), self._get_edit_cols()
+                )
 
     # ──────────────────────────────────────────────
     # ロックモード
@@ -832,6 +966,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         """テーブル行選択→マップ中心移動（ロック中は移動しない）。
         複数選択時は全選択フィーチャーの合算バウンディングボックス中心に移動する。
         """
+        self._status_timer.start()
         if self._locked:
             return
         if not current.isValid():
@@ -840,12 +975,8 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             return
 
         selected_fids = self._get_selected_fids()
-        if not selected_fids:
-            item = self.tableFeatures.item(current.row(), 0)
-            if item:
-                fid = item.data(Qt.UserRole)
-                if fid is not None:
-                    selected_fids = [fid]
+        if not selected_fids and current.row() < self._table_model.rowCount():
+            selected_fids = [self._table_model.fid(current.row())]
         if not selected_fids:
             return
 
@@ -867,7 +998,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             return point
 
         if len(selected_fids) == 1:
-            request = QgsFeatureRequest().setFilterFids(selected_fids)
+            request = QgsFeatureRequest().setFilterFids(selected_fids).setNoAttributes()
             feat = next(layer.getFeatures(request), None)
             if feat and not feat.geometry().isNull():
                 geom = feat.geometry()
@@ -879,7 +1010,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         else:
             # 複数選択: 全フィーチャーの合算バウンディングボックス中心へ移動
             combined_extent = None
-            request = QgsFeatureRequest().setFilterFids(selected_fids)
+            request = QgsFeatureRequest().setFilterFids(selected_fids).setNoAttributes()
             for feat in layer.getFeatures(request):
                 if feat.geometry().isNull():
                     continue
@@ -895,12 +1026,21 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
                     canvas.refresh()
 
     def _on_table_selection_changed(self, selected, deselected):
-        """テーブルの選択変更時：ラバーバンド/クロスヘアで表示しパン。"""
+        """テーブルの選択変更時：ラバーバンド/クロスヘアでの表示を予約する。"""
         if self._syncing_selection:
             return
+        if not self._locked and not self._plan_active:
+            return
+        self._highlight_timer.start()
+
+    def _apply_table_selection(self):
+        """テーブルの選択をラバーバンド/クロスヘアで表示しパン。"""
         if not self._locked and not self._plan_active:
             return
         fids = self._get_selected_fids()
+        key = (self._plan_active, self._temp_layer_valid(), frozenset(fids))
+        if key == self._last_highlight:
+            return
 
         # ── ポイントレイヤー専用パス（一時レイヤーなし）──
         is_point = (
@@ -911,6 +1051,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             self._clear_rubber_bands()
             if fids:
                 self._show_point_crosshairs(fids)
+            self._last_highlight = key
             self._render_thumbnail()
             self._pan_to_highlights()
             return
@@ -926,6 +1067,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             # 複数選択または選択なし: ラバーバンドをクリアして通常選択
             self._clear_rubber_bands()
             self._select_features(fids)
+        self._last_highlight = key
         self._render_thumbnail()
         self._pan_to_highlights()
 
@@ -961,7 +1103,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
                 canvas.refresh()
         elif self._rubber_bands:
             combined = QgsRectangle()
-            for rb in self._rubber_bands:
+            for _, rb in self._rubber_bands:
                 geom = rb.asGeometry()
                 if geom and not geom.isNull():
                     combined.combineExtentWith(geom.boundingBox())
@@ -969,20 +1111,43 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
                 canvas.setCenter(combined.center())
                 canvas.refresh()
 
+    def _selected_table_rows(self):
+        """テーブルで選択中の行番号を昇順で返す。
+
+        selectedIndexes() は選択セルの数だけインデックスを作るため、
+        選択範囲ごとの上端〜下端の行から求める。
+        """
+        rows = set()
+        for sel_range in self.tableFeatures.selectionModel().selection():
+            rows.update(range(sel_range.top(), sel_range.bottom() + 1))
+        return sorted(rows)
+
     def _get_selected_fids(self):
         """テーブルで選択中の全行のfidリストを返す。"""
-        selected_rows = set()
-        for idx in self.tableFeatures.selectionModel().selectedIndexes():
-            selected_rows.add(idx.row())
-
-        fids = []
-        for row in selected_rows:
-            item = self.tableFeatures.item(row, 0)
-            if item:
-                fid = item.data(Qt.UserRole)
-                if fid is not None:
-                    fids.append(fid)
-        return fids
+        return self._table_model.fids(self._selected_table_rows())
+
+    def _select_rows_by_fids(self, fids):
+        """fid に対応するテーブル行だけを選択する（既存の選択は解除）。
+
+        fid→行の索引で行を引き、連続する行をまとめた1回の選択操作で反映する。
+        """
+        model = self._table_model
+        rows = sorted(row for row in map(model.row_of, fids) if row is not None)
+        last_col = model.columnCount() - 1
+        selection = QItemSelection()
+        start = prev = None
+        for row in rows + [None]:
+            if start is not None and row != prev + 1:
+                selection.select(model.index(start, 0), model.index(prev, last_col))
+                start = None
+            if start is None:
+                start = row
+            prev = row
+        sel_model = self.tableFeatures.selectionModel()
+        if rows:
+            # selectRow と同様に最後の選択行をカレント行にする
+            sel_model.setCurrentIndex(model.index(rows[-1], 0), QItemSelectionModel.NoUpdate)
+        sel_model.select(selection, QItemSelectionModel.ClearAndSelect)
 
     def _copy_selected_cells(self):
         """選択セルをタブ区切りテキストとしてクリップボードにコピーする。"""
@@ -990,21 +1155,18 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         if not indexes:
             return
 
-        # 行・列でソート
-        rows = sorted(set(idx.row() for idx in indexes))
-        cols = sorted(set(idx.column() for idx in indexes))
-        selected_set = {(idx.row(), idx.column()) for idx in indexes}
+        # 選択セルの値を1回の走査で (行, 列) → 文字列 に集める
+        # （モデルの data を直接呼び、ビュー経由の問い合わせを省く）
+        model_data = self._table_model.data
+        cell_text = {(idx.row(), idx.column()): model_data(idx) or '' for idx in indexes}
 
-        lines = []
-        for row in rows:
-            cells = []
-            for col in cols:
-                if (row, col) in selected_set:
-                    item = self.tableFeatures.item(row, col)
-                    cells.append(item.text() if item else '')
-                else:
-                    cells.append('')
-            lines.append('\t'.join(cells))
+        # 行・列でソート（矩形内の未選択セルは空文字）
+        rows = sorted({r for r, _ in cell_text})
+        cols = sorted({c for _, c in cell_text})
+        lines = [
+            '\t'.join([cell_text.get((row, col), '') for col in cols])
+            for row in rows
+        ]
 
         QApplication.clipboard().setText('\n'.join(lines))
 
@@ -1021,26 +1183,25 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         if not paste_rows:
             return
 
-        indexes = self.tableFeatures.selectionModel().selectedIndexes()
+        sel_model = self.tableFeatures.selectionModel()
 
         # ── 1セルコピー: 選択中の全編集可能セルに同じ値を展開 ──
         if len(paste_rows) == 1 and len(paste_rows[0]) == 1:
             value = paste_rows[0][0]
-            targets = indexes if indexes else []
+            targets = sel_model.selectedIndexes()
             if not targets:
                 current = self.tableFeatures.currentIndex()
                 if current.isValid():
                     targets = [current]
-            for idx in targets:
-                item = self.tableFeatures.item(idx.row(), idx.column())
-                if item and (item.flags() & Qt.ItemIsEditable):
-                    item.setText(value)
+            self._table_model.set_values_bulk((idx, value) for idx in targets)
             return
 
         # ── 複数セルコピー: 左上を起点にグリッド展開 ──
-        if indexes:
-            start_row = min(idx.row() for idx in indexes)
-            start_col = min(idx.column() for idx in indexes)
+        # 起点は選択範囲の上端・左端から求める（セルごとのインデックスは作らない）
+        selection = sel_model.selection()
+        if not selection.isEmpty():
+            start_row = min(sel_range.top() for sel_range in selection)
+            start_col = min(sel_range.left() for sel_range in selection)
         else:
             current = self.tableFeatures.currentIndex()
             if not current.isValid():
@@ -1048,9 +1209,10 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             start_row = current.row()
             start_col = current.column()
 
-        row_count = self.tableFeatures.rowCount()
-        col_count = self.tableFeatures.columnCount()
+        row_count = self._table_model.rowCount()
+        col_count = self._table_model.columnCount()
 
+        values = []
         for pr, paste_row in enumerate(paste_rows):
             target_row = start_row + pr
             if target_row >= row_count:
@@ -1059,9 +1221,9 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
                 target_col = start_col + pc
                 if target_col >= col_count:
                     break
-                item = self.tableFeatures.item(target_row, target_col)
-                if item and (item.flags() & Qt.ItemIsEditable):
-                    item.setText(value)
+                values.append((self._table_model.index(target_row, target_col), value))
+        # 貼り付け全体を1回の保存（1トランザクション）にまとめる
+        self._table_model.set_values_bulk(values)
 
     # ──────────────────────────────────────────────
     # 地物選択連動
@@ -1084,15 +1246,8 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             if not layer:
                 return
             self._clear_rubber_bands()
-            selected_ids = set(layer.selectedFeatureIds())
             self._syncing_selection = True
-            self.tableFeatures.selectionModel().clearSelection()
-            for row in range(self.tableFeatures.rowCount()):
-                item = self.tableFeatures.item(row, 0)
-                if item:
-                    fid = item.data(Qt.UserRole)
-                    if fid in selected_ids:
-                        self.tableFeatures.selectRow(row)
+            self._select_rows_by_fids(layer.selectedFeatureIds())
             self._syncing_selection = False
             if not self._locked:
                 self._pan_to_selected()
@@ -1103,15 +1258,10 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         """レイヤーのソースがオリジナルGPKGと同じか判定する（パスとレイヤー名の両方を比較）。"""
         if not layer or not self.data_manager.original_path:
             return False
-        parts = layer.source().split('|')
-        if os.path.normpath(parts[0]) != os.path.normpath(self.data_manager.original_path):
+        _, path_norm, layername = _parse_layer_source(layer.source())
+        if path_norm != _normpath(self.data_manager.original_path):
             return False
         # layername が取得できる場合は照合する（単一レイヤーGPKGは layername なしの場合あり）
-        layername = None
-        for part in parts[1:]:
-            if part.startswith('layername='):
-                layername = part[len('layername='):]
-                break
         if layername is not None and self.data_manager.layer_name:
             return layername == self.data_manager.layer_name
         return True
@@ -1210,21 +1360,50 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         self._temp_layer.setSubsetString(f"fid IN ({fid_str})")
 
     def _clear_rubber_bands(self):
-        """ラバーバンドとマーカーをすべて削除する。"""
-        for rb in self._rubber_bands:
-            self.iface.mapCanvas().scene().removeItem(rb)
+        """ラバーバンドとマーカーをすべて削除する。
+
+        ラバーバンドはシーンから削除せず、非表示にしてプールへ戻す。
+        """
+        self._last_highlight = None
+        for geom_type, rb in self._rubber_bands:
+            rb.reset(geom_type)
+            rb.hide()
+            self._rubber_band_pool.setdefault(geom_type, []).append(rb)
         self._rubber_bands.clear()
         for vm in self._vertex_markers:
             self.iface.mapCanvas().scene().removeItem(vm)
         self._vertex_markers.clear()
 
+    def _acquire_rubber_band(self, geom_type):
+        """ジオメトリ種別に合うラバーバンドをプールから取り出す（なければ作成）。"""
+        pool = self._rubber_band_pool.get(geom_type)
+        if pool:
+            rb = pool.pop()
+            rb.show()
+        else:
+            rb = QgsRubberBand(self.iface.mapCanvas(), geom_type)
+            rb.setColor(QColor(255, 0, 0, 160))
+            rb.setFillColor(QColor(255, 220, 0, 30))
+            rb.setWidth(2)
+        self._rubber_bands.append((geom_type, rb))
+        return rb
+
+    def _release_rubber_band_pool(self):
+        """プール中のラバーバンドをキャンバスから削除する。"""
+        self._clear_rubber_bands()
+        scene = self.iface.mapCanvas().scene()
+        for pool in self._rubber_band_pool.values():
+            for rb in pool:
+                scene.removeItem(rb)
+        self._rubber_band_pool.clear()
+
     def _show_point_crosshairs(self, fids):
         """ポイントフィーチャーを白ハロ＋赤本体のクロスヘアで表示する。"""
         layer = self.data_manager.original_layer
         if not layer:
             return
         canvas = self.iface.mapCanvas()
-        request = QgsFeatureRequest().setFilterFids(fids)
+        request = QgsFeatureRequest().setFilterFids(fids).setNoAttributes()
         for feat in layer.getFeatures(request):
             if feat.geometry().isNull():
                 continue
@@ -1250,17 +1429,12 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         layer = (self._temp_layer if self._temp_layer_valid() else None) if self._plan_active else self.data_manager.original_layer
         if not layer:
             return
-        request = QgsFeatureRequest().setFilterFids([fid])
+        request = QgsFeatureRequest().setFilterFids([fid]).setNoAttributes()
         feat = next(layer.getFeatures(request), None)
         if not feat or feat.geometry().isNull():
             return
-        geom_type = layer.geometryType()
-        rb = QgsRubberBand(self.iface.mapCanvas(), geom_type)
-        rb.setColor(QColor(255, 0, 0, 160))
-        rb.setFillColor(QColor(255, 220, 0, 30))
-        rb.setWidth(2)
+        rb = self._acquire_rubber_band(layer.geometryType())
         rb.setToGeometry(feat.geometry(), layer)
-        self._rubber_bands.append(rb)
 
     def _apply_history_layer_style(self, layer):
         """履歴から読み込んだレイヤーにスタイルを適用する（塗りつぶし20%）。"""
@@ -1326,17 +1500,10 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         """一時レイヤーの選択変更をテーブルに反映する。"""
         if self._syncing_selection or not self._temp_layer_valid():
             return
-        selected_ids = set(self._temp_layer.selectedFeatureIds())
         # 地図からの選択ではラバーバンドをクリア（レイヤー選択で表示）
         self._clear_rubber_bands()
         self._syncing_selection = True
-        self.tableFeatures.selectionModel().clearSelection()
-        for row in range(self.tableFeatures.rowCount()):
-            item = self.tableFeatures.item(row, 0)
-            if item:
-                fid = item.data(Qt.UserRole)
-                if fid in selected_ids:
-                    self.tableFeatures.selectRow(row)
+        self._select_rows_by_fids(self._temp_layer.selectedFeatureIds())
         self._syncing_selection = False
         if not self._locked:
             self._pan_to_selected()
@@ -1351,23 +1518,33 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         if not self._is_same_source(active_layer):
             return
 
-        selected = active_layer.selectedFeatures()
-        if not selected:
+        selected_ids = active_layer.selectedFeatureIds()
+        if not selected_ids:
             self._clear_table()
             self.lblStatus.setText(self.tr('地物が選択されていません'))
             return
 
+        # 前回テーブルに反映した選択と同じなら再構築しない
+        selection_sig = (active_layer.id(), frozenset(selected_ids))
+        if selection_sig == self._last_selection_sig:
+            return
+
         # 同じGPKGレイヤーなら選択フィーチャーIDをそのまま使う
+        # （selectedFeatureIds は順序を持たない集合なので fid 順に並べる）
         if self._is_same_source(active_layer):
-            fids = [f.id() for f in selected]
+            fids = sorted(selected_ids)
         else:
             # 異なるレイヤーの場合は空間交差で検索
-            combined_geom = QgsGeometry()
-            for feat in selected:
-                if combined_geom.isNull():
-                    combined_geom = QgsGeometry(feat.geometry())
-                else:
-                    combined_geom = combined_geom.combine(feat.geometry())
+            # （逐次 combine ではなく unaryUnion で一括結合する。属性は読まない）
+            request = QgsFeatureRequest().setFilterFids(selected_ids).setNoAttributes()
+            geoms = [
+                g for g in (f.geometry() for f in active_layer.getFeatures(request))
+                if not g.isNull()
+            ]
+            if not geoms:
+                self._clear_table()
+                return
+            combined_geom = QgsGeometry.unaryUnion(geoms)
 
             if combined_geom.isNull():
                 self._clear_table()
@@ -1380,9 +1557,10 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             self.lblStatus.setText(self.tr('交差するフィーチャーがありません'))
             return
 
-        self._current_fids = fids
+        self._set_current_fids(fids)
         self._mark_plan_dirty()
         self._update_table(fids)
+        self._last_selection_sig = selection_sig
         self.lblStatus.setText(
             self.tr('{} 件のフィーチャーが見つかりました').format(len(fids))
         )
@@ -1391,35 +1569,59 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
     # テーブル表示
     # ──────────────────────────────────────────────
 
+    def _set_column_config(self, config):
+        """カラム設定を差し替え、カラム種別のキャッシュを無効化する。"""
+        self.column_config = config
+        self._col_cfg_version += 1
+        self._last_selection_sig = None
+
+    def _col_lists(self):
+        """カラム設定から種別ごとのカラムをタプルで返す（設定が変わるまでキャッシュ）。"""
+        if self._col_cache_ver != self._col_cfg_version:
+            items = self.column_config.items()
+            display = tuple(c for c, v in items if v == COLUMN_DISPLAY)
+            edit = tuple(c for c, v in items if v == COLUMN_EDITABLE)
+            info = tuple(c for c, v in items if v == COLUMN_INFO)
+            self._col_cache = (display, edit, info, display + edit + info, frozenset(edit))
+            self._col_cache_ver = self._col_cfg_version
+        return self._col_cache
+
     def _get_display_cols(self):
-        return [c for c, v in self.column_config.items() if v == COLUMN_DISPLAY]
+        return self._col_lists()[0]
 
     def _get_edit_cols(self):
-        return [c for c, v in self.column_config.items() if v == COLUMN_EDITABLE]
+        return self._col_lists()[1]
 
     def _get_info_cols(self):
-        return [c for c, v in self.column_config.items() if v == COLUMN_INFO]
+        return self._col_lists()[2]
 
     def _get_visible_cols(self):
-        return self._get_display_cols() + self._get_edit_cols() + self._get_info_cols()
+        return self._col_lists()[3]
+
+    def _get_edit_col_set(self):
+        return self._col_lists()[4]
+
+    def _set_current_fids(self, fids):
+        """表示中の fid リストを差し替え、所属判定用の集合も作り直す。"""
+        self._current_fids = fids
+        self._current_fids_set = set(fids)
 
     def _clear_table(self):
-        self._editing = True
-        self.tableFeatures.setRowCount(0)
-        self.tableFeatures.setColumnCount(0)
-        self._current_fids = []
+        self._table_model.clear()
+        self._last_highlight = None
+        self._last_selection_sig = None
+        self._cancel_fetch()
+        self._set_current_fids([])
         self._current_merged_data = []
-        self._editing = False
-        self._update_status_display()
+        self._status_timer.start()
 
     def _update_table(self, fids):
         import time
-        from qgis.core import QgsMessageLog, Qgis
         _plan = self._active_plan_name or '(no plan)'
         _ut0 = time.perf_counter()
 
-        self._editing = True
-
+        self._last_selection_sig = None  # 選択以外の経路での更新後は必ず再構築させる
+        self._cancel_fetch()
         display_cols = self._get_display_cols()
         edit_cols = self._get_edit_cols()
         info_cols = self._get_info_cols()
@@ -1430,96 +1632,216 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             self.lblStatus.setText(
                 self.tr('表示カラムが設定されていません。カラム設定を行ってください。')
             )
-            self._editing = False
+            return
+
+        if len(fids) >= ASYNC_FETCH_MIN_FEATURES:
+            # 大量の場合は別スレッドで取得し、完了後に _on_fetch_finished で表示する
+            self._fetch_job_id += 1
+            job_id = self._fetch_job_id
+            worker = FeatureFetchWorker(job_id, self.data_manager.prepare_merged_fetch(
+                fids, display_cols + info_cols, edit_cols, self._active_plan_name
+            ))
+            worker.signals.finished.connect(self._on_fetch_finished)
+            worker.signals.failed.connect(self._on_fetch_failed)
+            self._pending_fetch = (job_id, visible_cols, edit_cols, _plan, _ut0)
+            self.tableFeatures.setEnabled(False)  # 読み込み中は表示中の古い行を編集させない
+            self._fetch_pool.start(worker)
             return
 
         merged = self.data_manager.get_merged_features(
             fids, display_cols + info_cols, edit_cols, self._active_plan_name
         )
-        _ut1 = time.perf_counter()
+        self._show_merged(merged, visible_cols, edit_cols, _plan, _ut0, time.perf_counter())
 
-        self.tableFeatures.setColumnCount(len(visible_cols))
-        self.tableFeatures.setHorizontalHeaderLabels(visible_cols)
-        self.tableFeatures.setRowCount(len(merged))
-        _ut2 = time.perf_counter()
+    def _can_update_rows_in_place(self, count):
+        """表示中のテーブルに行を追加・削除するだけで済むかを返す。
 
-        self.tableFeatures.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
-        for row_idx, row_data in enumerate(merged):
-            fid = row_data['fid']
-            edited_cols = row_data.get('_edited_cols', set())
-
-            for col_idx, col_name in enumerate(visible_cols):
-                value = row_data.get(col_name, '')
-                item = QTableWidgetItem(str(value) if value is not None else '')
-                item.setData(Qt.UserRole, fid)
-                item.setData(Qt.UserRole + 1, col_name)
-
-                if col_name in edit_cols:
-                    item.setFlags(item.flags() | Qt.ItemIsEditable)
-                    # 色分け: 編集済み=赤、未編集=青
-                    if col_name in edited_cols:
-                        item.setForeground(COLOR_EDITED)
-                    else:
-                        item.setForeground(COLOR_EDITABLE)
-                else:
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                    # 表示のみ = 黒（デフォルト）
+        テーブルが空の場合はカラムが未設定のことがあるため作り直す。
+        """
+        return (
+            self._pending_fetch is None
+            and self._table_model.rowCount() > 0
+            and bool(self._get_visible_cols())
+            and count < ASYNC_FETCH_MIN_FEATURES
+        )
 
-                self.tableFeatures.setItem(row_idx, col_idx, item)
+    def _append_rows(self, fids):
+        """追加された fid の行だけを取得して末尾に追加する。"""
+        if not self._can_update_rows_in_place(len(fids)):
+            self._update_table(self._current_fids)
+            return
+        merged = self.data_manager.get_merged_features(
+            fids, self._get_display_cols() + self._get_info_cols(),
+            self._get_edit_cols(), self._active_plan_name,
+        )
+        self.tableFeatures.setUpdatesEnabled(False)
+        try:
+            self._table_model.append_rows(merged)
+        finally:
+            self.tableFeatures.setUpdatesEnabled(True)
+        self._after_rows_changed()
+
+    def _remove_rows(self, fids):
+        """削除された fid の行だけをテーブルから取り除く。"""
+        if not self._can_update_rows_in_place(0):
+            self._update_table(self._current_fids)
+            return
+        # 離れた行の削除は区間ごとに通知されるため、途中の再描画を止める
+        self.tableFeatures.setUpdatesEnabled(False)
+        try:
+            self._table_model.remove_fids(fids)
+        finally:
+            self.tableFeatures.setUpdatesEnabled(True)
+        self._after_rows_changed()
+
+    def _after_rows_changed(self):
+        """行の追加・削除後に表示データと件数表示を同期する。"""
+        self._last_selection_sig = None
+        self._last_highlight = None
+        # モデルの行リストをそのまま表示データとして参照する
+        self._current_merged_data = self._table_model.rows()
+        self._update_feature_count()
+        self._status_timer.start()
 
-        _ut3 = time.perf_counter()
+    def _cancel_fetch(self):
+        """取得中の非同期ジョブがあれば、その結果を捨てるようにする。"""
+        if self._pending_fetch is not None:
+            self._pending_fetch = None
+            self.tableFeatures.setEnabled(True)
 
-        self.tableFeatures.horizontalHeader().setSectionResizeMode(
-            QHeaderView.ResizeToContents
+    def _on_fetch_finished(self, job_id, merged):
+        """別スレッドでの結合データ取得が完了した時。"""
+        import time
+        pending = self._pending_fetch
+        if pending is None or pending[0] != job_id:
+            return  # 新しい要求に置き換えられた結果は捨てる
+        self._cancel_fetch()
+        _, visible_cols, edit_cols, _plan, _ut0 = pending
+        self._show_merged(merged, visible_cols, edit_cols, _plan, _ut0, time.perf_counter())
+
+    def _on_fetch_failed(self, job_id, message):
+        """別スレッドでの結合データ取得が失敗した時。"""
+        from qgis.core import QgsMessageLog, Qgis
+        pending = self._pending_fetch
+        if pending is None or pending[0] != job_id:
+            return
+        self._cancel_fetch()
+        QgsMessageLog.logMessage(
+            f'[update_table] fetch failed: {message}', 'GPKG Editor', Qgis.Warning
         )
-        self.tableFeatures.horizontalHeader().setMinimumSectionSize(100)
-        _ut4 = time.perf_counter()
+        self.lblStatus.setText(
+            self.tr('フィーチャーの読み込みに失敗しました: {}').format(message)
+        )
+
+    def _show_merged(self, merged, visible_cols, edit_cols, _plan, _ut0, _ut1):
+        """取得済みの結合データをテーブルに表示する。"""
+        import time
+        from qgis.core import QgsMessageLog, Qgis
+
+        # モデルは merged を直接参照し、表示セルの値だけをビューが問い合わせる。
+        # 差し替えと列幅設定の間は再描画を止め、最後に1回だけ描画する。
+        self.tableFeatures.setUpdatesEnabled(False)
+        try:
+            self._table_model.set_data(merged, visible_cols, edit_cols)
+            self._fit_column_widths(merged, visible_cols)
+        finally:
+            self.tableFeatures.setUpdatesEnabled(True)
+        self._last_highlight = None  # モデルのリセットでは選択変更が通知されない
+        _ut2 = time.perf_counter()
 
-        self._editing = False
         self._current_merged_data = merged
         self._update_feature_count()
-        self._update_status_display()
+        self._status_timer.start()
 
         QgsMessageLog.logMessage(
             f'[update_table] plan={_plan!r} '
             f'get_merged={_ut1-_ut0:.3f}s '
-            f'setup={_ut2-_ut1:.3f}s '
-            f'setItem={_ut3-_ut2:.3f}s '
-            f'resize={_ut4-_ut3:.3f}s '
-            f'total={_ut4-_ut0:.3f}s',
+            f'set_model={_ut2-_ut1:.3f}s '
+            f'total={_ut2-_ut0:.3f}s',
             'GPKG Editor', Qgis.Info
         )
 
+    def _can_reuse_table_rows(self, old_visible, old_edit):
+        """カラム設定の変更後も表示中の行データをそのまま使えるかを返す。
+
+        表示カラムの集合が変わらず、編集可否が切り替わったカラムに
+        編集データがなければ、行の値は再取得しても同じになる。
+        """
+        if not self._current_merged_data or self._pending_fetch is not None:
+            return False
+        if frozenset(self._get_visible_cols()) != old_visible:
+            return False
+        flipped = old_edit ^ self._get_edit_col_set()
+        return not self.data_manager.has_edits(self._active_plan_name, flipped)
+
+    def _refresh_table_columns(self):
+        """表示中の行データを再取得せず、カラムの並びと編集可否だけを反映する。"""
+        merged = self._current_merged_data
+        visible_cols = self._get_visible_cols()
+        self.tableFeatures.setUpdatesEnabled(False)
+        try:
+            self._table_model.set_data(merged, visible_cols, self._get_edit_cols())
+            self._fit_column_widths(merged, visible_cols)
+        finally:
+            self.tableFeatures.setUpdatesEnabled(True)
+        self._last_highlight = None  # モデルのリセットでは選択変更が通知されない
+        self._status_timer.start()
+
+    def _fit_column_widths(self, merged, visible_cols):
+        """先頭 TABLE_WIDTH_SAMPLE_ROWS 行とヘッダーの文字幅から列幅を決める。
+
+        ResizeToContents のように全行を測らず、幅は最小〜最大幅の範囲に収める。
+        """
+        header = self.tableFeatures.horizontalHeader()
+        metrics = self.tableFeatures.fontMetrics()
+        header_metrics = header.fontMetrics()
+        sample = merged[:TABLE_WIDTH_SAMPLE_ROWS]
+        for col_idx, col_name in enumerate(visible_cols):
+            width = header_metrics.horizontalAdvance(col_name)
+            for row_data in sample:
+                value = row_data.get(col_name)
+                if value is not None:
+                    width = max(width, metrics.horizontalAdvance(str(value)))
+            width = min(max(width + TABLE_WIDTH_PADDING, TABLE_MIN_SECTION_SIZE),
+                        TABLE_MAX_SECTION_SIZE)
+            header.resizeSection(col_idx, width)
+
     # ──────────────────────────────────────────────
     # セル編集
     # ──────────────────────────────────────────────
 
-    def _on_cell_changed(self, row, col):
-        if self._editing:
+    def _on_cell_changed(self, row, col_name, new_value):
+        """モデルで編集されたセル値を保存する。"""
+        if col_name not in self._get_edit_col_set():
             return
 
-        item = self.tableFeatures.item(row, col)
-        if not item:
-            return
-
-        fid = item.data(Qt.UserRole)
-        col_name = item.data(Qt.UserRole + 1)
-        new_value = item.text()
+        fid = self._table_model.fid(row)
+        try:
+            self.data_manager.save_edit(fid, col_name, new_value, self._active_plan_name)
+            # 値は merged data に反映してステータス表示も更新する。
+            # 赤字（編集済み）にするのは書き込みが確定してから（_on_edits_flushed）
+            self._table_model.set_value(row, col_name, new_value)
+            self._status_timer.start()
+        except Exception as e:
+            QMessageBox.warning(
+                self,
+                self.tr('保存エラー'),
+                self.tr('編集の保存に失敗しました: {}').format(e),
+            )
 
-        edit_cols = self._get_edit_cols()
-        if col_name not in edit_cols:
+    def _on_cells_changed(self, changes):
+        """貼り付け等でまとめて編集されたセル値 [(行番号, カラム名, 値), ...] を一括保存する。"""
+        edit_col_set = self._get_edit_col_set()
+        changes = [c for c in changes if c[1] in edit_col_set]
+        if not changes:
             return
 
+        model = self._table_model
         try:
-            self.data_manager.save_edit(fid, col_name, new_value, edit_cols, self._active_plan_name)
-            # 編集済み → 赤字に変更
-            item.setForeground(COLOR_EDITED)
-            # merged data を更新してステータス表示に反映
-            for row_data in self._current_merged_data:
-                if row_data['fid'] == fid:
-                    row_data[col_name] = new_value
-                    break
-            self._update_status_display()
+            self.data_manager.save_edits_bulk(
+                [(model.fid(row), col_name, value) for row, col_name, value in changes],
+                self._active_plan_name,
+            )
         except Exception as e:
             QMessageBox.warning(
                 self,
@@ -1527,6 +1849,23 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
                 self.tr('編集の保存に失敗しました: {}').format(e),
             )
 
+    def _on_edits_flushed(self, edits):
+        """管理用DBへの書き込みが確定した編集を、表示中の計画の行で編集済み（赤字）にする。"""
+        plan_name = self._active_plan_name
+        edits = [(fid, col, value) for plan, fid, col, value in edits if plan == plan_name]
+        if not edits:
+            return
+        self._table_model.mark_saved(edits)
+        self._status_timer.start()
+
+    def _on_edit_flush_failed(self, error):
+        """遅延書き込みの失敗を通知する。未保存の編集は赤字にせず、次回の書き込みで再試行する。"""
+        QMessageBox.warning(
+            self,
+            self.tr('保存エラー'),
+            self.tr('編集の保存に失敗しました: {}').format(error),
+        )
+
     # ──────────────────────────────────────────────
     # 計画管理
     # ──────────────────────────────────────────────
@@ -1541,6 +1880,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         if not enabled:
             self._deactivate_plan()
             self.cmbPlan.clear()
+            self._plan_combo_key = None
             self.lineEditPlanName.clear()
             self.lblFeatureCount.setText(self.tr('フィーチャー数: -'))
 
@@ -1553,6 +1893,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         )
         self.cmbPlan.blockSignals(True)
         self.cmbPlan.clear()
+        self._plan_combo_key = None
         for name in self.data_manager.list_plans():
             self.cmbPlan.addItem(name)
         self.cmbPlan.setCurrentIndex(-1)
@@ -1583,14 +1924,17 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             i += 1
 
     def _mark_plan_dirty(self):
+        self._plan_dirty = True
         self.btnPlanSave.setStyleSheet(
             'QPushButton { background-color: #e8a020; color: white; }'
         )
 
     def _mark_plan_clean(self):
+        self._plan_dirty = False
         self.btnPlanSave.setStyleSheet('')
 
     def _do_copy_plan(self, source_name):
+        self._flush_plan_save()
         new_name = self._unique_copy_name(source_name)
         self.data_manager.copy_plan(source_name, new_name)
         self._refresh_plan_combo()
@@ -1599,15 +1943,25 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             self.cmbPlan.setCurrentIndex(idx)
 
     def _refresh_plan_combo(self):
+        plans = self.data_manager.list_plans()
+        placeholder = self.tr('-- 計画を選択 --')
+        copy_text = self.tr('-- 計画をコピーして開始 --')
+        # 表示言語が変わった場合も作り直すよう、翻訳済みの項目名も比較する
+        combo_key = (placeholder, copy_text, plans)
         self.cmbPlan.blockSignals(True)
+        if combo_key == self._plan_combo_key:
+            # 計画一覧が変わっていなければ項目は作り直さず、選択だけ戻す
+            self.cmbPlan.setCurrentIndex(0)
+            self.cmbPlan.blockSignals(False)
+            return
+        self._plan_combo_key = combo_key
         self.cmbPlan.clear()
-        self.cmbPlan.addItem(self.tr('-- 計画を選択 --'))
-        plans = self.data_manager.list_plans()
+        self.cmbPlan.addItem(placeholder)
         for name in plans:
             self.cmbPlan.addItem(name)
         if plans:
             self.cmbPlan.insertSeparator(self.cmbPlan.count())
-            self.cmbPlan.addItem(self.tr('-- 計画をコピーして開始 --'))
+            self.cmbPlan.addItem(copy_text)
             self.cmbPlan.setItemData(
                 self.cmbPlan.count() - 1, self._COPY_SENTINEL
             )
@@ -1615,6 +1969,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         self.cmbPlan.blockSignals(False)
 
     def _on_plan_selected(self, index):
+        self._flush_plan_save()
         if self._copy_mode:
             if index >= 0:
                 source_name = self.cmbPlan.itemText(index)
@@ -1638,14 +1993,13 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
 
         raw_config = plan['column_config']
         raw_config.pop('__col_order__', None)  # 旧バージョンの残存キーを除去
-        self.column_config = raw_config
-        self._current_fids = plan['fids']
+        self._set_column_config(raw_config)
+        self._set_current_fids(plan['fids'])
         self.lineEditPlanName.setText(plan_name)
 
         # ステータス式を復元
         status_exprs = plan.get('status_exprs', {})
-        self._status_expr1 = status_exprs.get('expr1', '')
-        self._status_expr2 = status_exprs.get('expr2', '')
+        self._set_status_exprs(status_exprs.get('expr1', ''), status_exprs.get('expr2', ''))
 
         import time
         _t0 = time.perf_counter()
@@ -1677,6 +2031,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         )
 
     def _on_plan_save(self):
+        self._flush_plan_save()
         name = self.lineEditPlanName.text().strip()
         if not name:
             QMessageBox.warning(
@@ -1731,6 +2086,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         if ret != QMessageBox.Yes:
             return
 
+        self._flush_plan_save()
         self.data_manager.delete_plan(name)
         self._deactivate_plan()
         self.lineEditPlanName.clear()
@@ -1747,6 +2103,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         """計画をアクティブ状態にする。"""
         self._plan_active = True
         self._active_plan_name = name
+        self._last_selection_sig = None
         self.btnPlanAddFeature.setEnabled(True)
         self.btnPlanDeleteFeature.setEnabled(True)
         self.btnHistory.setEnabled(True)
@@ -1780,8 +2137,10 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
 
     def _deactivate_plan(self):
         """計画のアクティブ状態を解除する。"""
+        self._flush_plan_save()
         self._plan_active = False
         self._active_plan_name = None
+        self._last_selection_sig = None
         self._feature_add_mode = False
         self._mark_plan_clean()
         self.btnPlanAddFeature.setText(self.tr('フィーチャーの追加'))
@@ -1819,24 +2178,18 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             self.lblStatus.setText(self.tr('フィーチャーの追加をキャンセルしました'))
             return
 
-        selected = active_layer.selectedFeatures()
-        if not selected:
+        # fid だけ使うのでフィーチャー（属性・ジオメトリ）は取得しない。
+        # selectedFeatureIds は順序を持たない集合なので、計画に追加する順序を
+        # 一定にするため fid 順に並べる（selectedFeatures の取得順と同じ）
+        new_fids = sorted(active_layer.selectedFeatureIds())
+        if not new_fids:
             self._feature_add_mode = False
             self.btnPlanAddFeature.setText(self.tr('フィーチャーの追加'))
             self.lblStatus.setText(self.tr('フィーチャーの追加をキャンセルしました'))
             return
 
-        # 追加対象のfidを取得（_get_add_mode_layer は同一ソースのみ返す）
-        new_fids = [f.id() for f in selected]
-
-        if not new_fids:
-            QMessageBox.information(
-                self, self.tr('追加'), self.tr('追加対象のフィーチャーがありません。')
-            )
-            return
-
         # 既存fidsと重複しないものだけ追加
-        existing = set(self._current_fids)
+        existing = self._current_fids_set
         added = [fid for fid in new_fids if fid not in existing]
 
         if not added:
@@ -1861,15 +2214,19 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             return
 
         self._current_fids = self._current_fids + added
-
-        # 計画を自動保存
-        self.data_manager.save_plan(
-            self._active_plan_name, self._current_fids, self.column_config,
-            self._get_status_exprs(),
+        self._current_fids_set.update(added)
+
+        # 計画を自動保存。保存済みの状態から fid の追加だけが変わった場合は
+        # 追加分だけを追記し、それ以外は全体の保存を予約する
+        appended = (
+            not self._plan_dirty
+            and self._pending_plan_save is None
+            and self.data_manager.append_plan_fids(self._active_plan_name, added)
         )
-        self._mark_plan_clean()
+        if not appended:
+            self._schedule_plan_save()
 
-        self._update_table(self._current_fids)
+        self._append_rows(added)
         self._update_temp_layer_subset()
 
         # モードをリセット
@@ -1893,8 +2250,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
     def _update_add_mode_button(self):
         """追加モード中のボタン表示を選択状態に合わせて更新する。"""
         active_layer = self._get_add_mode_layer()
-        selected = active_layer.selectedFeatures() if active_layer else []
-        if selected:
+        if active_layer and active_layer.selectedFeatureCount():
             self.btnPlanAddFeature.setText(self.tr('選択を確定する'))
         else:
             self.btnPlanAddFeature.setText(self.tr('キャンセル'))
@@ -1905,8 +2261,8 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             return
 
         # テーブルで選択されている行からfidを取得
-        selected_indexes = self.tableFeatures.selectionModel().selectedIndexes()
-        if not selected_indexes:
+        selected_rows = self._selected_table_rows()
+        if not selected_rows:
             QMessageBox.warning(
                 self,
                 self.tr('削除エラー'),
@@ -1914,13 +2270,7 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             )
             return
 
-        remove_fids = set()
-        for idx in selected_indexes:
-            item = self.tableFeatures.item(idx.row(), 0)
-            if item:
-                fid = item.data(Qt.UserRole)
-                if fid is not None:
-                    remove_fids.add(fid)
+        remove_fids = set(self._table_model.fids(selected_rows))
 
         if not remove_fids:
             return
@@ -1940,15 +2290,12 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         self._current_fids = [
             fid for fid in self._current_fids if fid not in remove_fids
         ]
+        self._current_fids_set.difference_update(remove_fids)
 
-        # 計画を自動保存
-        self.data_manager.save_plan(
-            self._active_plan_name, self._current_fids, self.column_config,
-            self._get_status_exprs(),
-        )
-        self._mark_plan_clean()
+        # 計画を自動保存（書き込みはまとめて行う）
+        self._schedule_plan_save()
 
-        self._update_table(self._current_fids)
+        self._remove_rows(remove_fids)
         self._update_temp_layer_subset()
         self.lblStatus.setText(
             self.tr('{} 件のフィーチャーを削除しました (計 {} 件)').format(
@@ -1973,30 +2320,59 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             '例: "名称" || \' - \' || "種別" || \'  (\' || count() || \'件)\''
         )
 
+    def _set_status_exprs(self, expr1, expr2):
+        """ステータス式を設定し、表示更新用に字句解析済みの式を保持する。"""
+        self._status_expr1 = expr1
+        self._status_expr2 = expr2
+        self._status_code1 = compile_expr(expr1)
+        self._status_code2 = compile_expr(expr2)
+
     def _get_status_exprs(self):
         """現在のステータス式を辞書として返す。"""
         return {'expr1': self._status_expr1, 'expr2': self._status_expr2}
 
     def _auto_save_plan_status(self):
         """計画アクティブ時にステータス式の変更を自動保存する。"""
+        self._schedule_plan_save()
+
+    def _schedule_plan_save(self):
+        """アクティブな計画の保存を予約する。
+
+        続けて変更があれば PLAN_SAVE_DELAY_MS 待ち直し、最後に1回だけ書き込む。
+        """
         if self._plan_active and self._active_plan_name:
-            self.data_manager.save_plan(
-                self._active_plan_name, self._current_fids, self.column_config,
-                self._get_status_exprs(),
-            )
+            self._pending_plan_save = self._active_plan_name
+            self._save_timer.start()
+
+    def _flush_plan_save(self):
+        """予約中の計画保存があれば直ちに書き込む。
+
+        計画の切り替え・削除・コピーの前にも呼び、保存待ちの内容が
+        別の計画の状態で上書きされないようにする。
+        """
+        self._save_timer.stop()
+        name, self._pending_plan_save = self._pending_plan_save, None
+        if not name or name != self._active_plan_name:
+            return
+        if self.data_manager.save_plan(
+            name, self._current_fids, self.column_config,
+            self._get_status_exprs(),
+        ):
+            # 書き込みが済んでから保存済み表示にする
+            self._mark_plan_clean()
 
     def _on_status_row1_config(self):
         text, ok = self._edit_status_expr(self.tr('ステータス1行目'), self._status_expr1)
         if ok:
-            self._status_expr1 = text
-            self._update_status_display()
+            self._set_status_exprs(text, self._status_expr2)
+            self._status_timer.start()
             self._auto_save_plan_status()
 
     def _on_status_row2_config(self):
         text, ok = self._edit_status_expr(self.tr('ステータス2行目'), self._status_expr2)
         if ok:
-            self._status_expr2 = text
-            self._update_status_display()
+            self._set_status_exprs(self._status_expr1, text)
+            self._status_timer.start()
             self._auto_save_plan_status()
 
     # 関数挿入ボタンの定義: (ボタンラベル, 挿入テキスト)
@@ -2062,20 +2438,38 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
             return edit.toPlainText(), True
         return current_text, False
 
+    def _on_table_data_changed(self):
+        """表示データが変わった時に集計キャッシュを破棄する。"""
+        self._agg_cache.clear()
+        self._data_version += 1
+
     def _update_status_display(self):
-        """ステータス表示ラベルを選択行の式評価結果で更新する。"""
+        """ステータス表示ラベルを選択行の式評価結果で更新する。
+
+        選択行・式・表示データがいずれも前回と同じなら評価を省く。
+        """
+        code1 = self._status_code1
+        code2 = self._status_code2
+        if not code1.source and not code2.source:
+            key = None  # 式が未設定なら行やデータによらず空表示
+        else:
+            key = (self.tableFeatures.currentIndex().row(), code1, code2, self._data_version)
+        if key == self._last_status_key:
+            return
+        self._last_status_key = key
+
         row_data = self._get_selected_row_data()
         data = self._current_merged_data
         self.lblStatusRow1.setText(
-            evaluate_row_expr(self._status_expr1, row_data, data)
+            evaluate_row_expr(self._status_code1, row_data, data, self._agg_cache)
         )
         self.lblStatusRow2.setText(
-            evaluate_row_expr(self._status_expr2, row_data, data)
+            evaluate_row_expr(self._status_code2, row_data, data, self._agg_cache)
         )
 
     def _get_selected_row_data(self):
         """テーブルで選択中の行のデータを返す。"""
-        row_idx = self.tableFeatures.currentRow()
+        row_idx = self.tableFeatures.currentIndex().row()
         if row_idx < 0 or row_idx >= len(self._current_merged_data):
             return {}
         return self._current_merged_data[row_idx]
@@ -2579,9 +2973,10 @@ class GpkgEditorWindow(QWidget, FORM_CLASS):
         path = os.path.join(folder, filename)
 
         # プロジェクト内でこのファイルを使用中のレイヤーを検索
+        path_norm = os.path.normpath(path)
         using_layers = [
             layer for layer in QgsProject.instance().mapLayers().values()
-            if os.path.normpath(layer.source().split('|')[0]) == os.path.normpath(path)
+            if _parse_layer_source(layer.source())[1] == path_norm
         ]
 
         if using_layers:
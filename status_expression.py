@@ -29,118 +29,127 @@
 例（集計値を表示）:
     '設定済: ' || count("施業種" != '') || '/' || count()
 """
+import operator
+import re
+from functools import lru_cache
 
 
-def evaluate_row_expr(expr, row, data=None):
+class CompiledExpr:
+    """構文解析済みの式。式が変わるまで使い回し、評価のたびの解析を省く。"""
+
+    def __init__(self, expr):
+        self.source = expr or ''
+        self.node = _compile(self.source) if self.source else None
+
+
+def compile_expr(expr):
+    """式文字列を構文木に変換して CompiledExpr を返す。"""
+    return CompiledExpr(expr)
+
+
+def evaluate_row_expr(expr, row, data=None, agg_cache=None):
     """選択行のデータに対して式を評価する。
 
     Args:
-        expr: QGIS式風の式文字列
+        expr: QGIS式風の式文字列、または compile_expr の戻り値
         row: dict（選択行のデータ）。カラム参照はこの行の値を返す。
         data: list of dict（テーブル全行）。集計関数はこの全行に対して評価。
+        agg_cache: dict（省略可）。集計結果は選択行によらないため、渡すと
+            集計ノードごとの結果を保持して再利用する。data の内容が変わったら
+            呼び出し側で空にすること。
 
     Returns:
         str: 評価結果の文字列
     """
-    if not expr:
+    if not isinstance(expr, CompiledExpr):
+        expr = CompiledExpr(expr)
+    if not expr.source:
         return ''
-    expr = expr.replace('\n', ' ').replace('\r', '')
+    if expr.node is not None:
+        try:
+            return _format(expr.node.eval(row, _EvalCtx(data or [], agg_cache)))
+        except Exception:  # nosec B110
+            pass
+    # 評価できない式は改行を除いてそのまま表示する
+    return expr.source.replace('\n', ' ').replace('\r', '')
+
+
+@lru_cache(maxsize=64)
+def _compile(expr):
+    """式文字列を構文木に変換する（解析できなければ None）。"""
     try:
-        tokens = _tokenize(expr)
-        ev = _Evaluator(tokens, data or [], row)
-        result = ev.parse_concat()
-        return _format(result)
+        tokens = _tokenize(expr.replace('\n', ' ').replace('\r', ''))
+        return _Parser(tokens).parse_concat()
     except Exception:
-        return expr
+        return None
 
 
 # ──────────────────────────────────────────────
 # トークナイザ
 # ──────────────────────────────────────────────
 
+_TOKEN_RE = re.compile(r"""
+      (?P<WS>\s+)
+    | '(?P<STR>[^']*)'?                 # 文字列リテラル 'text'（閉じなければ末尾まで）
+    | "(?P<COL>[^"]*)"?                 # カラム参照 "column_name"
+    | (?P<NUM>(?:\d|\.\d)[\d.]*)          # 数値
+    | (?P<OP>\|\||!=|>=|<=|[=><+\-*/])    # 2文字演算子 → 1文字演算子の順に照合
+    | (?P<LPAREN>\()
+    | (?P<RPAREN>\))
+    | (?P<COMMA>,)
+    | (?P<IDENT>[^\W\d]\w*)              # 識別子
+    | (?P<SKIP>.)                       # それ以外の文字は読み飛ばす
+""", re.VERBOSE | re.DOTALL)
+
+
+@lru_cache(maxsize=256)
 def _tokenize(expr):
-    tokens = []
-    i = 0
-    n = len(expr)
-    while i < n:
-        c = expr[i]
-
-        if c.isspace():
-            i += 1
-            continue
-
-        # 文字列リテラル 'text'
-        if c == "'":
-            j = i + 1
-            while j < n and expr[j] != "'":
-                j += 1
-            tokens.append(('STR', expr[i + 1:j]))
-            i = j + 1
-            continue
-
-        # カラム参照 "column_name"
-        if c == '"':
-            j = i + 1
-            while j < n and expr[j] != '"':
-                j += 1
-            tokens.append(('COL', expr[i + 1:j]))
-            i = j + 1
-            continue
-
-        # 数値
-        if c.isdigit() or (c == '.' and i + 1 < n and expr[i + 1].isdigit()):
-            j = i
-            while j < n and (expr[j].isdigit() or expr[j] == '.'):
-                j += 1
-            tokens.append(('NUM', float(expr[i:j])))
-            i = j
-            continue
-
-        # 2文字演算子
-        two = expr[i:i + 2]
-        if two in ('||', '!=', '>=', '<='):
-            tokens.append(('OP', two))
-            i += 2
-            continue
-
-        # 1文字演算子
-        if c in '=><+-*/':
-            tokens.append(('OP', c))
-            i += 1
-            continue
+    """式文字列をトークンのタプルに分割する（走査は正規表現エンジンに任せる）。
 
-        if c == '(':
-            tokens.append(('LPAREN', '('))
-            i += 1
-            continue
-        if c == ')':
-            tokens.append(('RPAREN', ')'))
-            i += 1
-            continue
-        if c == ',':
-            tokens.append(('COMMA', ','))
-            i += 1
-            continue
-
-        # 識別子
-        if c.isalpha() or c == '_':
-            j = i
-            while j < n and (expr[j].isalnum() or expr[j] == '_'):
-                j += 1
-            tokens.append(('IDENT', expr[i:j]))
-            i = j
+    同じ式文字列の結果はキャッシュし、共有されるため変更不可のタプルで返す。
+    """
+    tokens = []
+    for m in _TOKEN_RE.finditer(expr):
+        kind = m.lastgroup
+        if kind == 'WS' or kind == 'SKIP':
             continue
-
-        i += 1
-
-    return tokens
+        if kind == 'NUM':
+            tokens.append(('NUM', float(m.group(kind))))
+        else:
+            tokens.append((kind, m.group(kind)))
+    return tuple(tokens)
 
 
 # ──────────────────────────────────────────────
 # ヘルパー
 # ──────────────────────────────────────────────
 
+# 演算子の分類（パーサでの判定用）
+_COMPARE_OPS = frozenset(('=', '!=', '>', '<', '>=', '<='))
+_ADD_OPS = frozenset(('+', '-'))
+_MUL_OPS = frozenset(('*', '/'))
+_LITERAL_KINDS = frozenset(('NUM', 'STR'))
+_AGGREGATE_FUNCS = frozenset(('count', 'sum', 'min', 'max', 'unique'))
+
+# 演算子 → 演算関数（if の連鎖の代わりに1回の辞書引きで決める）
+_COMPARE_FUNCS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+}
+_ARITH_FUNCS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+}
+
+
 def _format(value):
+    if type(value) is str:  # 最も多い文字列はそのまま返す
+        return value
     if value is None:
         return ''
     if isinstance(value, bool):
@@ -151,6 +160,8 @@ def _format(value):
 
 
 def _to_str(value):
+    if type(value) is str:  # 最も多い文字列はそのまま返す
+        return value
     if value is None:
         return ''
     if isinstance(value, float):
@@ -159,41 +170,19 @@ def _to_str(value):
 
 
 def _compare(left, op, right):
+    fn = _COMPARE_FUNCS.get(op)
+    if fn is None:
+        return False
     # 数値比較を試行
     try:
         lf = float(left) if not isinstance(left, (int, float)) else left
         rf = float(right) if not isinstance(right, (int, float)) else right
-        if isinstance(lf, (int, float)) and isinstance(rf, (int, float)):
-            if op == '=':
-                return lf == rf
-            if op == '!=':
-                return lf != rf
-            if op == '>':
-                return lf > rf
-            if op == '<':
-                return lf < rf
-            if op == '>=':
-                return lf >= rf
-            if op == '<=':
-                return lf <= rf
     except (TypeError, ValueError):
         pass
+    else:
+        return fn(lf, rf)
     # 文字列比較
-    ls = _to_str(left)
-    rs = _to_str(right)
-    if op == '=':
-        return ls == rs
-    if op == '!=':
-        return ls != rs
-    if op == '>':
-        return ls > rs
-    if op == '<':
-        return ls < rs
-    if op == '>=':
-        return ls >= rs
-    if op == '<=':
-        return ls <= rs
-    return False
+    return fn(_to_str(left), _to_str(right))
 
 
 def _is_truthy(value):
@@ -209,26 +198,28 @@ def _is_truthy(value):
 
 
 # ──────────────────────────────────────────────
-# 再帰下降パーサ / 評価器
+# 再帰下降パーサ（トークン列 → 構文木）
 # ──────────────────────────────────────────────
 
-class _Evaluator:
-    """QGIS式風の再帰下降パーサ兼評価器。
+class _Parser:
+    """QGIS式風の再帰下降パーサ。トークン列から構文木を組み立てる。"""
 
-    row=None のとき集計コンテキスト（トップレベル）。
-    row=dict のとき行コンテキスト（集計関数の引数内）。
-    """
+    __slots__ = ('tokens', 'pos', 'end')
 
-    def __init__(self, tokens, data, row=None):
+    def __init__(self, tokens, start=0, end=None):
+        """tokens[start:end] を解析する（部分列はコピーせず範囲で持つ）。"""
         self.tokens = tokens
-        self.data = data
-        self.row = row
-        self.pos = 0
+        self.pos = start
+        self.end = len(tokens) if end is None else end
 
     def _peek(self):
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return None
+        pos = self.pos
+        return self.tokens[pos] if pos < self.end else None
+
+    def _peek_kind(self):
+        """次のトークンの種別を返す（終端なら None）。"""
+        t = self._peek()
+        return t[0] if t else None
 
     def _consume(self):
         t = self.tokens[self.pos]
@@ -238,66 +229,57 @@ class _Evaluator:
     # ── 文字列結合 ──
 
     def parse_concat(self):
-        left = self._parse_compare()
-        while self._peek() and self._peek() == ('OP', '||'):
+        parts = [self._parse_compare()]
+        while self._peek() == ('OP', '||'):
             self._consume()
-            right = self._parse_compare()
-            left = _to_str(left) + _to_str(right)
-        return left
+            parts.append(self._parse_compare())
+        return parts[0] if len(parts) == 1 else _Concat(parts)
 
     # ── 比較 ──
 
     def _parse_compare(self):
         left = self._parse_add()
         t = self._peek()
-        if t and t[0] == 'OP' and t[1] in ('=', '!=', '>', '<', '>=', '<='):
-            op = self._consume()[1]
+        if t and t[0] == 'OP' and t[1] in _COMPARE_OPS:
+            self._consume()
             right = self._parse_add()
-            return _compare(left, op, right)
+            return _Compare(left, t[1], right)
         return left
 
     # ── 加減算 ──
 
     def _parse_add(self):
         left = self._parse_mul()
-        while (self._peek() and self._peek()[0] == 'OP'
-               and self._peek()[1] in ('+', '-')):
-            op = self._consume()[1]
+        while True:
+            t = self._peek()
+            if not (t and t[0] == 'OP' and t[1] in _ADD_OPS):
+                break
+            self._consume()
+            op = t[1]
             right = self._parse_mul()
-            try:
-                lf = float(left)
-                rf = float(right)
-                left = lf + rf if op == '+' else lf - rf
-            except (TypeError, ValueError):
-                left = None
+            left = _Arith(left, op, right)
         return left
 
     # ── 乗除算 ──
 
     def _parse_mul(self):
         left = self._parse_unary()
-        while (self._peek() and self._peek()[0] == 'OP'
-               and self._peek()[1] in ('*', '/')):
-            op = self._consume()[1]
+        while True:
+            t = self._peek()
+            if not (t and t[0] == 'OP' and t[1] in _MUL_OPS):
+                break
+            self._consume()
+            op = t[1]
             right = self._parse_unary()
-            try:
-                lf = float(left)
-                rf = float(right)
-                left = lf * rf if op == '*' else (lf / rf if rf != 0 else None)
-            except (TypeError, ValueError):
-                left = None
+            left = _Arith(left, op, right)
         return left
 
     # ── 単項マイナス ──
 
     def _parse_unary(self):
-        if self._peek() and self._peek() == ('OP', '-'):
+        if self._peek() == ('OP', '-'):
             self._consume()
-            val = self._parse_unary()
-            try:
-                return -float(val)
-            except (TypeError, ValueError):
-                return None
+            return _Neg(self._parse_unary())
         return self._parse_primary()
 
     # ── プライマリ ──
@@ -305,39 +287,33 @@ class _Evaluator:
     def _parse_primary(self):
         t = self._peek()
         if not t:
-            return None
-
-        if t[0] == 'NUM':
-            self._consume()
-            return t[1]
+            return _NULL
 
-        if t[0] == 'STR':
+        if t[0] in _LITERAL_KINDS:
             self._consume()
-            return t[1]
+            return _Lit(t[1])
 
         if t[0] == 'COL':
             self._consume()
-            if self.row is not None:
-                return self.row.get(t[1])
-            return None
+            return _Col(t[1])
 
         if t[0] == 'IDENT':
             name = t[1]
             self._consume()
-            if self._peek() and self._peek()[0] == 'LPAREN':
+            if self._peek_kind() == 'LPAREN':
                 self._consume()  # LPAREN
                 return self._parse_function(name.lower())
-            return None
+            return _NULL
 
         if t[0] == 'LPAREN':
             self._consume()
-            val = self.parse_concat()
-            if self._peek() and self._peek()[0] == 'RPAREN':
+            node = self.parse_concat()
+            if self._peek_kind() == 'RPAREN':
                 self._consume()
-            return val
+            return node
 
         self._consume()
-        return None
+        return _NULL
 
     # ── 関数 ──
 
@@ -346,111 +322,65 @@ class _Evaluator:
             return self._parse_if()
         if name == 'round':
             return self._parse_round()
-        if name in ('count', 'sum', 'min', 'max', 'unique'):
+        if name in _AGGREGATE_FUNCS:
             return self._parse_aggregate(name)
         self._skip_to_rparen()
-        return None
+        return _NULL
 
     def _parse_if(self):
         cond = self.parse_concat()
-        if self._peek() and self._peek()[0] == 'COMMA':
+        if self._peek_kind() == 'COMMA':
             self._consume()
-        true_val = self.parse_concat()
-        if self._peek() and self._peek()[0] == 'COMMA':
+        true_node = self.parse_concat()
+        if self._peek_kind() == 'COMMA':
             self._consume()
-        false_val = self.parse_concat()
-        if self._peek() and self._peek()[0] == 'RPAREN':
+        false_node = self.parse_concat()
+        if self._peek_kind() == 'RPAREN':
             self._consume()
-        return true_val if _is_truthy(cond) else false_val
+        return _If(cond, true_node, false_node)
 
     def _parse_aggregate(self, func_name):
         # 引数なし: count()
-        if self._peek() and self._peek()[0] == 'RPAREN':
+        if self._peek_kind() == 'RPAREN':
             self._consume()
-            if func_name == 'count':
-                return len(self.data)
-            return None
-
-        arg_tokens = self._collect_arg_tokens()
-
-        # 各行で引数を評価
-        results = []
-        for row in self.data:
-            ev = _Evaluator(arg_tokens, self.data, row)
-            results.append(ev.parse_concat())
-
-        if func_name == 'count':
-            return sum(1 for v in results if _is_truthy(v))
-
-        if func_name == 'sum':
-            total = 0.0
-            for v in results:
-                try:
-                    total += float(v)
-                except (TypeError, ValueError):
-                    pass
-            return total
-
-        if func_name in ('min', 'max'):
-            nums = []
-            for v in results:
-                if v is not None and str(v) != '':
-                    try:
-                        nums.append(float(v))
-                    except (TypeError, ValueError):
-                        nums.append(str(v))
-            if not nums:
-                return None
-            return min(nums) if func_name == 'min' else max(nums)
-
-        if func_name == 'unique':
-            vals = set()
-            for v in results:
-                if v is not None and str(v) != '':
-                    vals.add(str(v))
-            return len(vals)
-
-        return None
+            return _Aggregate(func_name, None)
+        # 引数は閉じ括弧までのトークン範囲を別に解析する（行ごとに評価する部分木）
+        start, end = self._arg_token_range()
+        arg = _Parser(self.tokens, start, end).parse_concat()
+        return _Aggregate(func_name, arg)
 
     def _parse_round(self):
         value = self.parse_concat()
         ndigits = None
-        if self._peek() and self._peek()[0] == 'COMMA':
+        if self._peek_kind() == 'COMMA':
             self._consume()
             ndigits = self.parse_concat()
-        if self._peek() and self._peek()[0] == 'RPAREN':
+        if self._peek_kind() == 'RPAREN':
             self._consume()
-        try:
-            num = float(value)
-        except (TypeError, ValueError):
-            return None
-        if ndigits is None or ndigits == '':
-            return round(num)
-        try:
-            return round(num, int(float(ndigits)))
-        except (TypeError, ValueError):
-            return round(num)
+        return _Round(value, ndigits)
 
-    def _collect_arg_tokens(self):
-        """閉じ括弧までのトークンを収集する。"""
+    def _arg_token_range(self):
+        """閉じ括弧までのトークン範囲 (開始, 終了) を返し、閉じ括弧の次へ進む。"""
+        tokens = self.tokens
+        end = self.end
         depth = 1
-        start = self.pos
-        while self.pos < len(self.tokens):
-            t = self.tokens[self.pos]
-            if t[0] == 'LPAREN':
+        start = pos = self.pos
+        while pos < end:
+            kind = tokens[pos][0]
+            if kind == 'LPAREN':
                 depth += 1
-            elif t[0] == 'RPAREN':
+            elif kind == 'RPAREN':
                 depth -= 1
                 if depth == 0:
-                    arg_tokens = self.tokens[start:self.pos]
-                    self.pos += 1
-                    return arg_tokens
-            self.pos += 1
-        return self.tokens[start:]
+                    self.pos = pos + 1
+                    return start, pos
+            pos += 1
+        self.pos = end
+        return start, end
 
     def _skip_to_rparen(self):
         depth = 1
-        while self.pos < len(self.tokens):
+        while self.pos < self.end:
             t = self._consume()
             if t[0] == 'LPAREN':
                 depth += 1
@@ -458,3 +388,305 @@ class _Evaluator:
                 depth -= 1
                 if depth == 0:
                     return
+
+
+# ──────────────────────────────────────────────
+# 構文木ノード
+# ──────────────────────────────────────────────
+# 各ノードは eval(row, ctx) で値を返す。
+# row はカラム参照に使う行、ctx.data は集計関数が走査する全行。
+# 集計では全行ぶん eval が呼ばれるため、ノードは __slots__ で属性参照を軽くする。
+
+class _EvalCtx:
+    """評価コンテキスト（集計対象の全行と集計結果のキャッシュ）。"""
+
+    __slots__ = ('data', 'agg_cache')
+
+    def __init__(self, data, agg_cache=None):
+        self.data = data
+        self.agg_cache = agg_cache
+
+
+class _Lit:
+    """数値・文字列リテラル。"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def eval(self, row, ctx):
+        return self.value
+
+
+_NULL = _Lit(None)  # 解釈できないトークン・未知の関数
+
+
+class _Col:
+    """カラム参照。"""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def eval(self, row, ctx):
+        if row is not None:
+            return row.get(self.name)
+        return None
+
+
+class _Concat:
+    """文字列結合 (||)。"""
+
+    __slots__ = ('parts',)
+
+    def __init__(self, parts):
+        self.parts = parts
+
+    def eval(self, row, ctx):
+        parts = iter(self.parts)
+        result = next(parts).eval(row, ctx)
+        for part in parts:
+            result = _to_str(result) + _to_str(part.eval(row, ctx))
+        return result
+
+
+class _Compare:
+    """比較演算。
+
+    右辺がリテラル（"COL" > 30 など）の場合は、リテラルの数値化・文字列化を
+    構文解析時に1回だけ行い、評価時は左辺の値だけを変換する。
+    """
+
+    __slots__ = ('left', 'op', 'right', 'fn', 'lit_float', 'lit_str')
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.right = right
+        self.fn = _COMPARE_FUNCS[op]
+        self.lit_float = None
+        self.lit_str = None
+        if type(right) is _Lit:
+            value = right.value
+            self.lit_str = _to_str(value)
+            try:
+                self.lit_float = value if isinstance(value, (int, float)) else float(value)
+            except (TypeError, ValueError):
+                pass
+
+    def eval(self, row, ctx):
+        lit_str = self.lit_str
+        if lit_str is None:
+            return _compare(self.left.eval(row, ctx), self.op, self.right.eval(row, ctx))
+        left = self.left.eval(row, ctx)
+        lit_float = self.lit_float
+        if lit_float is not None:
+            if isinstance(left, (int, float)):
+                return self.fn(left, lit_float)
+            try:
+                left_float = float(left)
+            except (TypeError, ValueError):
+                pass
+            else:
+                return self.fn(left_float, lit_float)
+        return self.fn(_to_str(left), lit_str)
+
+
+class _Arith:
+    """四則演算。数値に変換できない場合とゼロ除算は None。"""
+
+    __slots__ = ('left', 'op', 'fn', 'right')
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.fn = _ARITH_FUNCS.get(op)  # 除算は None（ゼロ除算の扱いが異なる）
+        self.right = right
+
+    def eval(self, row, ctx):
+        left = self.left.eval(row, ctx)
+        right = self.right.eval(row, ctx)
+        try:
+            lf = float(left)
+            rf = float(right)
+        except (TypeError, ValueError):
+            return None
+        fn = self.fn
+        if fn is None:  # 除算
+            return lf / rf if rf != 0 else None
+        return fn(lf, rf)
+
+
+class _Neg:
+    """単項マイナス。"""
+
+    __slots__ = ('child',)
+
+    def __init__(self, child):
+        self.child = child
+
+    def eval(self, row, ctx):
+        value = self.child.eval(row, ctx)
+        try:
+            return -float(value)
+        except (TypeError, ValueError):
+            return None
+
+
+class _If:
+    """if(条件, 真, 偽)。"""
+
+    __slots__ = ('cond', 'true_node', 'false_node')
+
+    def __init__(self, cond, true_node, false_node):
+        self.cond = cond
+        self.true_node = true_node
+        self.false_node = false_node
+
+    def eval(self, row, ctx):
+        if _is_truthy(self.cond.eval(row, ctx)):
+            return self.true_node.eval(row, ctx)
+        return self.false_node.eval(row, ctx)
+
+
+class _Round:
+    """round(数値[, 桁])。"""
+
+    __slots__ = ('value', 'ndigits')
+
+    def __init__(self, value, ndigits):
+        self.value = value
+        self.ndigits = ndigits
+
+    def eval(self, row, ctx):
+        value = self.value.eval(row, ctx)
+        ndigits = self.ndigits.eval(row, ctx) if self.ndigits is not None else None
+        try:
+            num = float(value)
+        except (TypeError, ValueError):
+            return None
+        if ndigits is None or ndigits == '':
+            return round(num)
+        try:
+            return round(num, int(float(ndigits)))
+        except (TypeError, ValueError):
+            return round(num)
+
+
+class _Aggregate:
+    """集計関数。引数の部分木をテーブル全行に対して評価して集計する。"""
+
+    __slots__ = ('func_name', 'arg', 'row_independent')
+
+    def __init__(self, func_name, arg):
+        self.func_name = func_name
+        self.arg = arg  # 引数なしは None
+        # 引数がカラムを参照しない（count(1) など）なら全行で同じ値になる
+        self.row_independent = arg is not None and not _refers_row(arg)
+
+    def eval(self, row, ctx):
+        cache = ctx.agg_cache
+        if cache is None:
+            return self._aggregate(ctx)
+        # 集計結果は選択行によらないので、ノードごとに1回だけ計算する
+        try:
+            return cache[self]
+        except KeyError:
+            value = cache[self] = self._aggregate(ctx)
+            return value
+
+    def _aggregate(self, ctx):
+        func_name = self.func_name
+        data = ctx.data
+        if self.arg is None:
+            return len(data) if func_name == 'count' else None
+
+        if self.row_independent:
+            return self._aggregate_constant(ctx)
+
+        if func_name == 'unique' and type(self.arg) is _Col:
+            return _count_unique(data, self.arg.name)
+
+        arg = self.arg
+        return _reduce(func_name, [arg.eval(r, ctx) for r in data])
+
+    def _aggregate_constant(self, ctx):
+        """行によらない引数の集計。引数を1回だけ評価し、行数倍して求める。"""
+        n = len(ctx.data)
+        if n == 0:
+            return _reduce(self.func_name, [])
+        value = _reduce(self.func_name, [self.arg.eval(None, ctx)])
+        if self.func_name in ('count', 'sum'):
+            return value * n
+        return value  # min / max / unique は1行でも全行でも同じ
+
+
+def _refers_row(node):
+    """部分木が評価中の行（カラム）を参照するか。
+
+    入れ子の集計関数は全行を対象にするので、行には依存しないとみなす。
+    """
+    kind = type(node)
+    if kind is _Col:
+        return True
+    if kind in (_Lit, _Aggregate):
+        return False
+    if kind is _Concat:
+        return any(_refers_row(part) for part in node.parts)
+    if kind in (_Compare, _Arith):
+        return _refers_row(node.left) or _refers_row(node.right)
+    if kind is _Neg:
+        return _refers_row(node.child)
+    if kind is _If:
+        return (_refers_row(node.cond) or _refers_row(node.true_node)
+                or _refers_row(node.false_node))
+    if kind is _Round:
+        return _refers_row(node.value) or (
+            node.ndigits is not None and _refers_row(node.ndigits))
+    return True  # 未知のノードは安全側（行ごとに評価）
+
+
+def _count_unique(data, name):
+    """unique("COL")。行ごとの式評価を省き、カラム値を文字列にして重複を除く。"""
+    # 1 と 1.0、0.0 と -0.0 のように等しくても文字列が異なる値は別々に数える
+    vals = {str(v) for v in (r.get(name) for r in data) if v is not None}
+    vals.discard('')
+    return len(vals)
+
+
+def _reduce(func_name, results):
+    """行ごとの評価結果を集計関数 func_name で集計する。"""
+    if func_name == 'count':
+        return sum(1 for v in results if _is_truthy(v))
+
+    if func_name == 'sum':
+        total = 0.0
+        for v in results:
+            try:
+                total += float(v)
+            except (TypeError, ValueError):
+                pass
+        return total
+
+    if func_name in ('min', 'max'):
+        nums = []
+        for v in results:
+            if v is not None and str(v) != '':
+                try:
+                    nums.append(float(v))
+                except (TypeError, ValueError):
+                    nums.append(str(v))
+        if not nums:
+            return None
+        return min(nums) if func_name == 'min' else max(nums)
+
+    if func_name == 'unique':
+        vals = set()
+        for v in results:
+            if v is not None and str(v) != '':
+                vals.add(str(v))
+        return len(vals)
+
+    return None